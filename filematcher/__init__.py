@@ -2,7 +2,8 @@
 
 This package provides tools for finding files with identical content across
 two directory hierarchies and can deduplicate them using hardlinks, symlinks,
-or deletion. It uses content hashing (MD5 or SHA-256) to identify matches.
+or deletion. It uses content hashing (BLAKE2b, SHA-256, MD5, or BLAKE3 with the
+optional blake3 package) to identify matches.
 
 The first directory (dir1) is the implicit master directory - files there
 are preserved while duplicates in dir2 are candidates for action.
@@ -58,6 +59,9 @@ from filematcher.hashing import (
     create_hasher,
     get_file_hash,
     get_sparse_hash,
+    get_mapped_hash,
+    cpu_has_sha_extensions,
+    resolve_hash_algorithm,
     LARGE_FILE_THRESHOLD,
     SPARSE_SAMPLE_SIZE,
     READ_CHUNK_SIZE,
@@ -92,6 +96,7 @@ from filematcher.actions import (
     create_audit_logger,
     write_log_header,
     log_operation,
+    format_operation_line,
     write_log_footer,
 )
 
@@ -100,6 +105,7 @@ from filematcher.actions import (
 from filematcher.formatters import (
     # Structured types
     SpaceInfo,
+    CompareStats,
     # Constants
     PREVIEW_BANNER,
     BANNER_SEPARATOR,
@@ -112,12 +118,15 @@ from filematcher.formatters import (
     format_duplicate_group,
     format_statistics_footer,
     calculate_space_savings,
+    calculate_compare_stats,
 )
 
 # Import from directory submodule (extracted module)
 # This import depends on hashing.py, actions.py, and filesystem.py
 from filematcher.directory import (
     index_directory,
+    scan_files,
+    hash_files,
     find_matching_files,
     select_master_file,
     select_oldest,
@@ -2,65 +2,113 @@
 
 from __future__ import annotations
 
+import contextlib
+import errno
+import functools
 import logging
 import os
 import shutil
 import sys
-from datetime import datetime
+import time
+from collections import deque
+from itertools import islice
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from filematcher.filesystem import is_hardlink_to, is_symlink_to
 from filematcher.types import Action, DuplicateGroup, FailedOperation
 
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
 logger = logging.getLogger(__name__)
 
+# Audit log lines buffered by execute_all_actions before each write
+AUDIT_LOG_BATCH_SIZE = 1000
+
+_SIZE_NAMES = ("B", "KB", "MB", "GB", "TB")
+
 
+# Cached: a duplicate group's files share one size, and verbose output formats it per file
+@functools.lru_cache(maxsize=4096)
 def format_file_size(size_bytes: int | float) -> str:
     """Convert file size in bytes to human-readable format (e.g., "1.5 MB")."""
     if size_bytes == 0:
         return "0 B"
 
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    while size_bytes >= 1024.0 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
+    # Unit index straight from the bit length: every 10 bits is one 1024x step
+    i = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_NAMES) - 1) if size_bytes >= 1024 else 0
 
     if i == 0:
-        return f"{int(size_bytes)} {size_names[i]}"
+        return f"{int(size_bytes)} {_SIZE_NAMES[i]}"
     else:
-        return f"{size_bytes:.1f} {size_names[i]}"
+        return f"{size_bytes / (1 << (i * 10)):.1f} {_SIZE_NAMES[i]}"
+
+
+def _create_hardlink(link_path: str, master: str, resolved_master: str | None = None) -> None:
+    os.link(master, link_path)
+
+
+def _create_symlink(link_path: str, master: str, resolved_master: str | None = None) -> None:
+    os.symlink(resolved_master if resolved_master is not None else os.path.realpath(master), link_path)
+
+
+# Keyed by plain value: str-mixin Enum members hash by name, so str(action) is the lookup key
+_LINK_CREATORS = {
+    Action.HARDLINK.value: _create_hardlink,
+    Action.SYMLINK.value: _create_symlink,
+}
 
 
-def safe_replace_with_link(duplicate: Path, master: Path, action: str) -> tuple[bool, str]:
-    """Safely replace duplicate with a link to master using temp-rename pattern with rollback."""
-    temp_path = duplicate.with_suffix(duplicate.suffix + '.filematcher_tmp')
+def _replace_with_link(
+    duplicate: str, master: str, action: str, resolved_master: str | None = None
+) -> tuple[bool, str, int | None]:
+    """safe_replace_with_link that also returns the failing OSError's errno (None on success).
+
+    resolved_master, if given, is master's real path and spares the symlink case resolving it.
+    """
+    if action == Action.DELETE:
+        try:
+            os.unlink(duplicate)
+        except OSError as e:
+            return (False, f"Failed to delete: {e}", e.errno)
+        return (True, "", None)
+
+    create_link = _LINK_CREATORS.get(str(action))
+    if create_link is None:
+        return (False, f"Unknown action: {action}", None)
+
+    temp_path = duplicate + '.filematcher_tmp'
 
     try:
-        duplicate.rename(temp_path)
+        create_link(temp_path, master, resolved_master)
     except OSError as e:
-        return (False, f"Failed to rename to temp: {e}")
+        return (False, f"Failed to create {action}: {e}", e.errno)
 
     try:
-        if action == Action.HARDLINK:
-            duplicate.hardlink_to(master)
-        elif action == Action.SYMLINK:
-            duplicate.symlink_to(master.resolve())
-        elif action == Action.DELETE:
-            pass
-        else:
-            temp_path.rename(duplicate)
-            return (False, f"Unknown action: {action}")
-
-        temp_path.unlink()
-        return (True, "")
-
+        os.replace(temp_path, duplicate)
     except OSError as e:
         try:
-            temp_path.rename(duplicate)
-        except OSError as rollback_err:
-            logger.error(f"CRITICAL: Rollback failed for {duplicate}, temp file left as {temp_path}: {rollback_err}")
-        return (False, f"Failed to create {action}: {e}")
+            os.unlink(temp_path)
+        except OSError as cleanup_err:
+            logger.error(f"Could not remove temp link {temp_path}: {cleanup_err}")
+        return (False, f"Failed to replace {duplicate} with {action}: {e}", e.errno)
+
+    return (True, "", None)
+
+
+def safe_replace_with_link(duplicate: str | Path, master: str | Path, action: str) -> tuple[bool, str]:
+    """Replace duplicate with a link to master by creating the link beside it and renaming over it.
+
+    os.replace is atomic, so the duplicate path always names either the original
+    file or the finished link, and a failure leaves the original untouched.
+    """
+    success, error, _ = _replace_with_link(os.fspath(duplicate), os.fspath(master), action)
+    return (success, error)
+
+
+# Actions execute_action can apply, keyed by plain value like _LINK_CREATORS
+_MODIFYING_ACTIONS = {a.value: a for a in (Action.HARDLINK, Action.SYMLINK, Action.DELETE)}
 
 
 def execute_action(
@@ -69,12 +117,14 @@ def execute_action(
     action: str,
     fallback_symlink: bool = False,
     target_dir: str | None = None,
-    dir2_base: str | None = None
+    dir2_base: str | None = None,
+    resolved_master: str | None = None
 ) -> tuple[bool, str, str]:
-    """Execute an action on a duplicate file. Returns (success, error, actual_action_used)."""
-    dup_path = Path(duplicate)
-    master_path = Path(master)
+    """Execute an action on a duplicate file. Returns (success, error, actual_action_used).
 
+    resolved_master is master's real path, for callers acting on many duplicates of one
+    master: symlinks then point at it without resolving master again for each duplicate.
+    """
     if is_symlink_to(duplicate, master):
         return (True, "symlink to master", "skipped")
     if is_hardlink_to(duplicate, master):
@@ -83,21 +133,21 @@ def execute_action(
     # Target directory mode: create link in target_dir, delete original
     if target_dir and dir2_base:
         dir2_path = Path(dir2_base).resolve()
+        dup_path = Path(duplicate)
         try:
             rel_path = dup_path.resolve().relative_to(dir2_path)
         except ValueError:
             return (False, f"Duplicate {duplicate} not under dir2 {dir2_base}", action)
 
+        create_link = _LINK_CREATORS.get(str(action))
+        if create_link is None:
+            return (False, f"Target-dir mode only supports hardlink/symlink, not {action}", action)
+
         target_path = Path(target_dir) / rel_path
         target_path.parent.mkdir(parents=True, exist_ok=True)
 
         try:
-            if action == Action.HARDLINK:
-                target_path.hardlink_to(master_path)
-            elif action == Action.SYMLINK:
-                target_path.symlink_to(master_path.resolve())
-            else:
-                return (False, f"Target-dir mode only supports hardlink/symlink, not {action}", action)
+            create_link(str(target_path), master, resolved_master)
 
             # Delete original
             dup_path.unlink()
@@ -111,28 +161,18 @@ def execute_action(
                     logger.warning(f"Could not clean up partial target {target_path}: {cleanup_err}")
             return (False, f"Failed to create {action} in target dir: {e}", action)
 
-    if action == Action.HARDLINK:
-        success, error = safe_replace_with_link(dup_path, master_path, Action.HARDLINK)
-        if not success and fallback_symlink:
-            error_lower = error.lower()
-            if 'cross-device' in error_lower or 'invalid cross-device link' in error_lower or 'errno 18' in error_lower:
-                success, error = safe_replace_with_link(dup_path, master_path, Action.SYMLINK)
-                if success:
-                    return (True, "", "symlink (fallback)")
-                return (False, error, "symlink (fallback)")
-        return (success, error, Action.HARDLINK)
-
-    elif action == Action.SYMLINK:
-        success, error = safe_replace_with_link(dup_path, master_path, Action.SYMLINK)
-        return (success, error, Action.SYMLINK)
-
-    elif action == Action.DELETE:
-        success, error = safe_replace_with_link(dup_path, master_path, Action.DELETE)
-        return (success, error, Action.DELETE)
-
-    else:
+    resolved_action = _MODIFYING_ACTIONS.get(str(action))
+    if resolved_action is None:
         return (False, f"Unknown action: {action}", action)
 
+    success, error, error_code = _replace_with_link(duplicate, master, resolved_action, resolved_master)
+    if error_code == errno.EXDEV and fallback_symlink and resolved_action == Action.HARDLINK:
+        success, error, _ = _replace_with_link(duplicate, master, Action.SYMLINK, resolved_master)
+        if success:
+            return (True, "", "symlink (fallback)")
+        return (False, error, "symlink (fallback)")
+    return (success, error, resolved_action)
+
 
 def determine_exit_code(success_count: int, failure_count: int) -> int:
     """Determine exit code: 0=full success, 1=total failure, 2=partial completion."""
@@ -144,6 +184,29 @@ def determine_exit_code(success_count: int, failure_count: int) -> int:
         return 2  # Partial completion (consistent with EXIT_PARTIAL in cli.py)
 
 
+def _process_duplicate(
+    dup: str,
+    master: str,
+    action: str,
+    fallback_symlink: bool,
+    target_dir: str | None,
+    dir2_base: str | None,
+    resolved_master: str | None = None
+) -> tuple[int | None, bool, str, str]:
+    """Stat and act on one duplicate. Returns (size or None if missing, success, error, actual_action)."""
+    # One stat gives both existence and size
+    try:
+        file_size = os.stat(dup).st_size
+    except OSError:
+        return (None, False, "", "")
+
+    success, error, actual_action = execute_action(
+        dup, master, action, fallback_symlink,
+        target_dir=target_dir, dir2_base=dir2_base, resolved_master=resolved_master
+    )
+    return (file_size, success, error, actual_action)
+
+
 def execute_all_actions(
     duplicate_groups: list[DuplicateGroup],
     action: str,
@@ -152,78 +215,149 @@ def execute_all_actions(
     audit_logger: logging.Logger | None = None,
     file_hashes: dict[str, str] | None = None,
     target_dir: str | None = None,
-    dir2_base: str | None = None
+    dir2_base: str | None = None,
+    jobs: int = 1
 ) -> tuple[int, int, int, int, list[FailedOperation]]:
-    """Process all duplicate groups with continue-on-error. Returns (success, fail, skip, bytes, failed_list)."""
+    """Process all duplicate groups with continue-on-error. Returns (success, fail, skip, bytes, failed_list).
+
+    With jobs > 1 the link/unlink syscalls run on a thread pool, a bounded window of
+    them at a time; results are still consumed in submission order so progress and
+    audit lines stay ordered. On error or Ctrl+C, operations not yet started are
+    cancelled and those already done are still audited before the exception propagates.
+    """
     success_count = 0
     failure_count = 0
     skipped_count = 0
     space_saved = 0
     failed_list: list[FailedOperation] = []
 
-    total_duplicates = sum(len(group.duplicates) for group in duplicate_groups)
-    processed = 0
-
-    if verbose:
-        is_tty = hasattr(sys.stderr, 'isatty') and sys.stderr.isatty()
+    # Symlinks point at the master's real path; resolving it once per group spares
+    # an lstat of every path component for each of the group's duplicates
+    makes_symlinks = action == Action.SYMLINK or (fallback_symlink and action == Action.HARDLINK)
 
+    tasks: list[tuple[DuplicateGroup, str, str | None]] = []
     for group in duplicate_groups:
         if not os.path.exists(group.master_file):
             logger.warning(f"Master file missing, skipping group: {group.master_file}")
             continue
+        resolved_master = os.path.realpath(group.master_file) if makes_symlinks else None
+        tasks.extend((group, dup, resolved_master) for dup in group.duplicates)
+
+    total_duplicates = sum(len(group.duplicates) for group in duplicate_groups)
+    processed = 0
+
+    if verbose:
+        is_tty = hasattr(sys.stderr, 'isatty') and sys.stderr.isatty()
+        # Format action verb: hardlink->Hardlinking, symlink->Symlinking, delete->Deleting
+        action_verb = "Deleting" if action == Action.DELETE else f"{action.title()}ing"
+
+    def run(task: tuple[DuplicateGroup, str, str | None]) -> tuple[int | None, bool, str, str]:
+        group, dup, resolved_master = task
+        return _process_duplicate(
+            dup, group.master_file, action, fallback_symlink, target_dir, dir2_base, resolved_master
+        )
+
+    # Audit lines are written in batches to cut per-record logging overhead
+    log_batch: list[str] = []
+
+    def flush_log_batch() -> None:
+        if log_batch:
+            audit_logger.info("\n".join(log_batch))
+            log_batch.clear()
+
+    def audit(group: DuplicateGroup, dup: str, file_size: int, success: bool, error: str, actual_action: str) -> None:
+        file_hash = file_hashes.get(dup, group.file_hash) if file_hashes else group.file_hash
+        log_batch.append(
+            format_operation_line(actual_action, dup, group.master_file, file_size, file_hash, success, error)
+        )
+        if len(log_batch) >= AUDIT_LOG_BATCH_SIZE:
+            flush_log_batch()
+
+    # Submitted but not yet consumed operations, oldest first
+    window: deque[tuple[tuple[DuplicateGroup, str, str | None], Future]] = deque()
+
+    def windowed_results(executor: ThreadPoolExecutor, window_size: int):
+        """Yield (task, result) in submission order, keeping at most window_size operations in flight.
+
+        A future leaves the window only once its result is in hand, so on error the
+        window holds every submitted operation whose result was never consumed.
+        """
+        task_iter = iter(tasks)
+        for task in islice(task_iter, window_size):
+            window.append((task, executor.submit(run, task)))
+        while window:
+            task, future = window[0]
+            result = future.result()
+            window.popleft()
+            next_task = next(task_iter, None)
+            if next_task is not None:
+                window.append((next_task, executor.submit(run, next_task)))
+            yield task, result
+
+    with contextlib.ExitStack() as stack:
+        # Registered first so it runs last: on error or Ctrl+C, pending audit lines are written
+        # after the pool has shut down and the lines for its finished operations were added
+        stack.callback(flush_log_batch)
+        executor = None
+        if jobs > 1 and len(tasks) > 1:
+            # Deferred: the thread pool (and threading) is only loaded for parallel runs
+            from concurrent.futures import ThreadPoolExecutor
+
+            workers = min(jobs, len(tasks))
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+            # Twice the workers keeps the pool busy while the results ahead are consumed,
+            # and bounds what is still in flight if the run is cut short
+            results = windowed_results(executor, 2 * workers)
+        else:
+            results = zip(tasks, map(run, tasks))
 
         try:
-            master_size = os.path.getsize(group.master_file)
-        except OSError as e:
-            logger.debug(f"Could not get size for master {group.master_file}: {e}")
-            master_size = 0
-
-        for dup in group.duplicates:
-            processed += 1
-
-            if not os.path.exists(dup):
-                logger.info(f"Duplicate no longer exists: {dup}")
-                skipped_count += 1
-                continue
-
-            try:
-                file_size = os.path.getsize(dup)
-            except OSError as e:
-                logger.debug(f"Could not get size for {dup}: {e}")
-                file_size = master_size
-
-            if verbose:
-                dup_basename = os.path.basename(dup)
-                size_str = format_file_size(file_size)
-                # Format action verb: hardlink->Hardlinking, symlink->Symlinking, delete->Deleting
-                action_verb = "Deleting" if action == Action.DELETE else f"{action.title()}ing"
-                if is_tty:
-                    progress_line = f"\r[{processed}/{total_duplicates}] {action_verb} {dup_basename} ({size_str})"
-                    term_width = shutil.get_terminal_size().columns
-                    if len(progress_line) > term_width:
-                        progress_line = progress_line[:term_width-3] + "..."
-                    sys.stderr.write(progress_line.ljust(term_width) + '\r')
-                    sys.stderr.flush()
+            for (group, dup, _), (file_size, success, error, actual_action) in results:
+                processed += 1
+
+                if file_size is None:
+                    logger.info(f"Duplicate no longer exists: {dup}")
+                    skipped_count += 1
+                    continue
+
+                # Audited before anything else, so an interrupt from here on cannot lose the line
+                if audit_logger:
+                    audit(group, dup, file_size, success, error, actual_action)
+
+                if verbose:
+                    dup_basename = os.path.basename(dup)
+                    size_str = format_file_size(file_size)
+                    if is_tty:
+                        progress_line = f"\r[{processed}/{total_duplicates}] {action_verb} {dup_basename} ({size_str})"
+                        term_width = shutil.get_terminal_size().columns
+                        if len(progress_line) > term_width:
+                            progress_line = progress_line[:term_width-3] + "..."
+                        sys.stderr.write(progress_line.ljust(term_width) + '\r')
+                        sys.stderr.flush()
+                    else:
+                        logger.debug(f"[{processed}/{total_duplicates}] {action_verb} {dup_basename} ({size_str})")
+
+                if actual_action == "skipped":
+                    skipped_count += 1
+                elif success:
+                    success_count += 1
+                    space_saved += file_size
                 else:
-                    logger.debug(f"[{processed}/{total_duplicates}] {action_verb} {dup_basename} ({size_str})")
-
-            success, error, actual_action = execute_action(
-                dup, group.master_file, action, fallback_symlink,
-                target_dir=target_dir, dir2_base=dir2_base
-            )
-
-            if audit_logger:
-                file_hash = file_hashes.get(dup, "unknown") if file_hashes else "unknown"
-                log_operation(audit_logger, actual_action, dup, group.master_file, file_size, file_hash, success, error)
-
-            if actual_action == "skipped":
-                skipped_count += 1
-            elif success:
-                success_count += 1
-                space_saved += file_size
-            else:
-                failure_count += 1
-                failed_list.append(FailedOperation(dup, error))
+                    failure_count += 1
+                    failed_list.append(FailedOperation(dup, error))
+        except BaseException:
+            if executor is not None:
+                # Queued operations are dropped; running ones finish, and every operation
+                # that completed without its result being consumed still gets its audit line
+                executor.shutdown(wait=True, cancel_futures=True)
+                if audit_logger:
+                    for (group, dup, _), future in window:
+                        if future.cancelled() or future.exception() is not None:
+                            continue
+                        file_size, success, error, actual_action = future.result()
+                        if file_size is not None:
+                            audit(group, dup, file_size, success, error, actual_action)
+            raise
 
     if verbose:
         if is_tty:
@@ -235,6 +369,9 @@ def execute_all_actions(
 
 def create_audit_logger(log_path: Path | None = None) -> tuple[logging.Logger, Path]:
     """Create a separate logger for audit logging to file. Returns (logger, actual_log_path)."""
+    # Deferred: datetime is only needed once an audit log is written (never in preview runs)
+    from datetime import datetime
+
     if log_path is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_dir = os.environ.get('FILEMATCHER_LOG_DIR')
@@ -271,23 +408,38 @@ def write_log_header(
     flags: list[str]
 ) -> None:
     """Write header block to audit log with run information."""
+    from datetime import datetime
+
     timestamp = datetime.now().isoformat()
     flags_str = ', '.join(flags) if flags else 'none'
 
-    audit_logger.info("=" * 80)
-    audit_logger.info("File Matcher Execution Log")
-    audit_logger.info("=" * 80)
-    audit_logger.info(f"Timestamp: {timestamp}")
-    audit_logger.info(f"Directories: {dir1}, {dir2}")
-    audit_logger.info(f"Master: {master}")
-    audit_logger.info(f"Action: {action}")
-    audit_logger.info(f"Flags: {flags_str}")
-    audit_logger.info("=" * 80)
-    audit_logger.info("")
+    # One record per block: a single handler lock and write instead of one per line
+    audit_logger.info("\n".join([
+        "=" * 80,
+        "File Matcher Execution Log",
+        "=" * 80,
+        f"Timestamp: {timestamp}",
+        f"Directories: {dir1}, {dir2}",
+        f"Master: {master}",
+        f"Action: {action}",
+        f"Flags: {flags_str}",
+        "=" * 80,
+        "",
+    ]))
 
 
-def log_operation(
-    audit_logger: logging.Logger,
+@functools.lru_cache(maxsize=1)
+def _timestamp_prefix(second: int) -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(second))
+
+
+def _audit_timestamp() -> str:
+    """Local ISO 8601 timestamp with milliseconds; the date/time part is formatted once per second."""
+    second, remainder = divmod(time.time_ns(), 1_000_000_000)
+    return f"{_timestamp_prefix(second)}.{remainder // 1_000_000:03d}"
+
+
+def format_operation_line(
     action: str,
     duplicate: str,
     master: str,
@@ -295,12 +447,12 @@ def log_operation(
     file_hash: str,
     success: bool,
     error: str = ""
-) -> None:
-    """Write a single operation line to the audit log."""
-    timestamp = datetime.now().isoformat()
+) -> str:
+    """Format a single operation line for the audit log."""
+    timestamp = _audit_timestamp()
     action_upper = action.upper()
     size_str = format_file_size(file_size)
-    hash_prefix = file_hash[:8] if len(file_hash) >= 8 else file_hash
+    hash_prefix = file_hash[:8]
 
     if success:
         result = "SUCCESS"
@@ -308,9 +460,23 @@ def log_operation(
         result = f"FAILED: {error}" if error else "FAILED"
 
     if action.lower() == 'delete':
-        audit_logger.info(f"[{timestamp}] {action_upper} {duplicate} ({size_str}) [{hash_prefix}...] {result}")
-    else:
-        audit_logger.info(f"[{timestamp}] {action_upper} {duplicate} -> {master} ({size_str}) [{hash_prefix}...] {result}")
+        return f"[{timestamp}] {action_upper} {duplicate} ({size_str}) [{hash_prefix}...] {result}"
+    return f"[{timestamp}] {action_upper} {duplicate} -> {master} ({size_str}) [{hash_prefix}...] {result}"
+
+
+def log_operation(
+    audit_logger: logging.Logger,
+    action: str,
+    duplicate: str,
+    master: str,
+    file_size: int,
+    file_hash: str,
+    success: bool,
+    error: str = ""
+) -> None:
+    """Write a single operation line to the audit log."""
+    if audit_logger.isEnabledFor(logging.INFO):
+        audit_logger.info(format_operation_line(action, duplicate, master, file_size, file_hash, success, error))
 
 
 def write_log_footer(
@@ -325,20 +491,22 @@ def write_log_footer(
     total = success_count + failure_count + skipped_count
     space_str = format_file_size(space_saved)
 
-    audit_logger.info("")
-    audit_logger.info("=" * 80)
-    audit_logger.info("Summary")
-    audit_logger.info("=" * 80)
-    audit_logger.info(f"Total files processed: {total}")
-    audit_logger.info(f"Successful: {success_count}")
-    audit_logger.info(f"Failed: {failure_count}")
-    audit_logger.info(f"Skipped: {skipped_count}")
-    audit_logger.info(f"Space saved: {space_str}")
+    lines = [
+        "",
+        "=" * 80,
+        "Summary",
+        "=" * 80,
+        f"Total files processed: {total}",
+        f"Successful: {success_count}",
+        f"Failed: {failure_count}",
+        f"Skipped: {skipped_count}",
+        f"Space saved: {space_str}",
+    ]
 
     if failed_list:
-        audit_logger.info("")
-        audit_logger.info("Failed files:")
-        for failure in failed_list:
-            audit_logger.info(f"  - {failure.file_path}: {failure.error_message}")
+        lines.append("")
+        lines.append("Failed files:")
+        lines.extend(f"  - {failure.file_path}: {failure.error_message}" for failure in failed_list)
 
-    audit_logger.info("=" * 80)
+    lines.append("=" * 80)
+    audit_logger.info("\n".join(lines))
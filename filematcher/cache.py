@@ -0,0 +1,101 @@
+"""Persistent hash cache for File Matcher.
+
+Stores each file's digest with the size and mtime it had when hashed, so a re-run
+only hashes files that changed since. Entries are keyed by device and inode, so a
+renamed file keeps its entry and hardlinked paths share one.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    fast INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    PRIMARY KEY (dev, ino, algorithm, fast)
+)
+"""
+
+
+class HashCache:
+    """SQLite-backed map of (st_dev, st_ino) -> (size, mtime_ns, digest) for one algorithm and mode.
+
+    Entries are read into memory once on open; new digests are written back in a
+    single transaction by save(). A size or mtime change makes an entry stale.
+    """
+
+    def __init__(self, path: str | Path, hash_algorithm: str, fast_mode: bool = False):
+        self.path = str(path)
+        self.hash_algorithm = hash_algorithm
+        self.fast_mode = fast_mode
+        self._entries: dict[tuple[int, int], tuple[int, int, bytes]] = {}
+        self._pending: list[tuple[int, int, int, int, bytes]] = []
+        self._conn = sqlite3.connect(self.path)
+        try:
+            # WAL with NORMAL sync: one fsync per checkpoint rather than per commit, and a
+            # crash can only lose recent entries, which are then simply rehashed
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(_SCHEMA)
+            rows = self._conn.execute(
+                "SELECT dev, ino, size, mtime_ns, digest FROM file_hashes WHERE algorithm = ? AND fast = ?",
+                (hash_algorithm, int(fast_mode))
+            )
+            self._entries = {(dev, ino): (size, mtime_ns, bytes(digest)) for dev, ino, size, mtime_ns, digest in rows}
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+
+    def get(self, file_stat: os.stat_result) -> bytes | None:
+        """Return the cached digest for the stat'd file if its size and mtime are unchanged, else None."""
+        entry = self._entries.get((file_stat.st_dev, file_stat.st_ino))
+        if entry is None or entry[0] != file_stat.st_size or entry[1] != file_stat.st_mtime_ns:
+            return None
+        return entry[2]
+
+    def put(self, file_stat: os.stat_result, digest: bytes) -> None:
+        """Record a freshly computed digest for the stat'd file; written to disk on save()."""
+        self._entries[(file_stat.st_dev, file_stat.st_ino)] = (file_stat.st_size, file_stat.st_mtime_ns, digest)
+        self._pending.append((file_stat.st_dev, file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns, digest))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def save(self) -> None:
+        """Write digests recorded since the last save in one transaction."""
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO file_hashes (dev, ino, algorithm, fast, size, mtime_ns, digest) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(dev, ino, self.hash_algorithm, int(self.fast_mode), size, mtime_ns, digest)
+                 for dev, ino, size, mtime_ns, digest in self._pending]
+            )
+        self._pending.clear()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> HashCache:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Saved even when the run is cut short: every recorded digest is still valid
+        try:
+            self.save()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update hash cache {self.path}: {e}")
+        finally:
+            self.close()
@@ -3,14 +3,16 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import logging
 import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from filematcher.colors import ColorConfig, determine_color_mode
 from filematcher.filesystem import (
-    check_cross_filesystem, filter_hardlinked_duplicates, is_in_directory,
+    check_cross_filesystem, filter_hardlinked_duplicates,
 )
 from filematcher.actions import (
     create_audit_logger, write_log_header, log_operation, write_log_footer,
@@ -19,10 +21,14 @@ from filematcher.actions import (
 from filematcher.types import Action, DuplicateGroup, FailedOperation
 from filematcher.formatters import (
     SpaceInfo, TextActionFormatter, JsonActionFormatter, ActionFormatter,
-    calculate_space_savings,
+    calculate_space_savings, calculate_compare_stats, DEFAULT_MAX_ERRORS_SHOWN,
 )
+from filematcher.hashing import cpu_has_sha_extensions, create_hasher, resolve_hash_algorithm
 from filematcher.directory import find_matching_files, select_master_file
 
+if TYPE_CHECKING:
+    from filematcher.cache import HashCache
+
 logger = logging.getLogger(__name__)
 
 # Exit codes
@@ -42,9 +48,12 @@ def _execute_group_duplicates(
     file_hashes: dict[str, str] | None,
     target_dir: str | None,
     dir2_base: str | None,
+    group_hash: str = "unknown",
 ) -> tuple[int, int, int, int, list[FailedOperation]]:
     """Execute action on all duplicates in a group.
 
+    group_hash is logged for duplicates not present in file_hashes.
+
     Returns: (success_count, failure_count, skipped_count, space_saved, failed_list)
     """
     success_count = 0
@@ -53,27 +62,36 @@ def _execute_group_duplicates(
     space_saved = 0
     failed_list: list[FailedOperation] = []
 
+    # Resolved once for the group rather than by each symlink created to it
+    resolved_master = None
+    if action == Action.SYMLINK or (fallback_symlink and action == Action.HARDLINK):
+        resolved_master = os.path.realpath(master_file)
+
     for dup in duplicates:
-        # Get file size BEFORE action (for space_saved calculation)
+        # Get file size BEFORE action (for space_saved calculation); one stat answers
+        # both whether it still exists and how big it is
         try:
-            file_size = os.path.getsize(dup) if os.path.exists(dup) else 0
+            file_size = os.stat(dup).st_size
+        except FileNotFoundError:
+            file_size = 0
         except OSError as e:
             formatter.format_file_error(dup, str(e))
             if audit_logger:
-                dup_hash = file_hashes.get(dup, "unknown") if file_hashes else "unknown"
+                dup_hash = file_hashes.get(dup, group_hash) if file_hashes else group_hash
                 log_operation(audit_logger, action.value, dup, master_file,
                               0, dup_hash, success=False, error=str(e))
             failure_count += 1
             failed_list.append(FailedOperation(dup, str(e)))
             continue
-        dup_hash = file_hashes.get(dup, "unknown") if file_hashes else "unknown"
+        dup_hash = file_hashes.get(dup, group_hash) if file_hashes else group_hash
 
         # Call execute_action with correct signature: (duplicate, master, action, ...)
         success, error, actual_action = execute_action(
             dup, master_file, action.value,
             fallback_symlink=fallback_symlink,
             target_dir=target_dir,
-            dir2_base=dir2_base
+            dir2_base=dir2_base,
+            resolved_master=resolved_master
         )
 
         # Log operation if audit logger provided
@@ -95,22 +113,21 @@ def _execute_group_duplicates(
     return (success_count, failure_count, skipped_count, space_saved, failed_list)
 
 
+_RESPONSES = {
+    'y': 'y', 'yes': 'y',
+    'n': 'n', 'no': 'n',
+    'a': 'a', 'all': 'a',
+    'q': 'q', 'quit': 'q',
+}
+
+
 def _normalize_response(response: str) -> str | None:
     """Normalize user response to single char or None if invalid.
 
     Accepts: y, yes, n, no, a, all, q, quit (case-insensitive)
     Returns: 'y', 'n', 'a', 'q', or None
     """
-    response = response.casefold()
-    if response in ('y', 'yes'):
-        return 'y'
-    elif response in ('n', 'no'):
-        return 'n'
-    elif response in ('a', 'all'):
-        return 'a'
-    elif response in ('q', 'quit'):
-        return 'q'
-    return None
+    return _RESPONSES.get(response.casefold())
 
 
 def prompt_for_group(
@@ -124,8 +141,8 @@ def prompt_for_group(
     Returns normalized single-char response: 'y', 'n', 'a', or 'q'.
     Raises: KeyboardInterrupt, EOFError (for caller to handle)
     """
+    prompt_text = formatter.format_group_prompt(group_index, total_groups, action)
     while True:
-        prompt_text = formatter.format_group_prompt(group_index, total_groups, action)
         response = input(prompt_text).strip()
 
         normalized = _normalize_response(response)
@@ -210,7 +227,7 @@ def interactive_execute(
                 s, f, sk, sp, fl = _execute_group_duplicates(
                     duplicates, master_file, action, formatter,
                     fallback_symlink, audit_logger, file_hashes,
-                    target_dir, dir2_base
+                    target_dir, dir2_base, group_hash=file_hash
                 )
                 success_count += s
                 failure_count += f
@@ -229,7 +246,7 @@ def interactive_execute(
                 s, f, sk, sp, fl = _execute_group_duplicates(
                     duplicates, master_file, action, formatter,
                     fallback_symlink, audit_logger, file_hashes,
-                    target_dir, dir2_base
+                    target_dir, dir2_base, group_hash=file_hash
                 )
                 success_count += s
                 failure_count += f
@@ -251,7 +268,7 @@ def interactive_execute(
                 s, f, sk, sp, fl = _execute_group_duplicates(
                     duplicates, master_file, action, formatter,
                     fallback_symlink, audit_logger, file_hashes,
-                    target_dir, dir2_base
+                    target_dir, dir2_base, group_hash=file_hash
                 )
                 success_count += s
                 failure_count += f
@@ -279,11 +296,15 @@ def interactive_execute(
 
 
 def build_file_hash_lookup(matches: dict[str, tuple[list[str], list[str]]]) -> dict[str, str]:
-    """Build a mapping of file paths to their content hashes."""
+    """Build a mapping of file paths to their content hashes.
+
+    Execution does not need this: every DuplicateGroup carries its hash, which
+    is what gets logged when no lookup is passed.
+    """
     lookup: dict[str, str] = {}
     for file_hash, (files1, files2) in matches.items():
-        for f in files1 + files2:
-            lookup[f] = file_hash
+        lookup.update(dict.fromkeys(files1, file_hash))
+        lookup.update(dict.fromkeys(files2, file_hash))
     return lookup
 
 
@@ -297,10 +318,16 @@ def get_cross_fs_count(action: Action, cross_fs_files: set[str]) -> int:
     return len(cross_fs_files) if action == Action.HARDLINK else 0
 
 
-def build_file_sizes(paths: list[str]) -> dict[str, int]:
-    """Build dict of file sizes with graceful error handling (0 if inaccessible)."""
+def build_file_sizes(paths: list[str], known_sizes: dict[str, int] | None = None) -> dict[str, int]:
+    """Build dict of file sizes with graceful error handling (0 if inaccessible).
+
+    Sizes already in known_sizes (e.g. from the directory scan) are reused without a stat.
+    """
     sizes: dict[str, int] = {}
     for p in paths:
+        if known_sizes and p in known_sizes:
+            sizes[p] = known_sizes[p]
+            continue
         try:
             sizes[p] = os.path.getsize(p)
         except OSError as e:
@@ -309,27 +336,60 @@ def build_file_sizes(paths: list[str]) -> dict[str, int]:
     return sizes
 
 
+@contextlib.contextmanager
+def _block_buffered_stdout():
+    """Turn off stdout's line buffering for the block, flushing once at the end.
+
+    A terminal's stdout is line buffered, so every group written would be its own
+    write() syscall; piped stdout is already block buffered and left alone.
+    """
+    stream = sys.stdout
+    if not getattr(stream, "line_buffering", False) or not hasattr(stream, "reconfigure"):
+        yield
+        return
+    stream.reconfigure(line_buffering=False)
+    try:
+        yield
+    finally:
+        # Restoring line buffering flushes what the block wrote
+        stream.reconfigure(line_buffering=True)
+
+
+def _open_hash_cache(path: str, hash_algorithm: str, fast_mode: bool) -> HashCache | None:
+    """Open the --cache database, or warn and return None so the run goes on uncached."""
+    # Deferred: sqlite3 is only loaded when a cache is asked for
+    import sqlite3
+
+    from filematcher.cache import HashCache
+
+    try:
+        cache = HashCache(path, hash_algorithm, fast_mode)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not open hash cache {path}: {e}; hashing every file")
+        return None
+    logger.info(f"Using hash cache {path} ({len(cache)} entries)")
+    return cache
+
+
 def build_log_flags(
     base_flags: list[str],
     verbose: bool = False,
     yes: bool = False,
     fallback_symlink: bool = False,
     log_path: str | None = None,
-    target_dir: str | None = None
+    target_dir: str | None = None,
+    jobs: int = 1
 ) -> list[str]:
     """Build flags list for audit log header."""
-    flags = list(base_flags)
-    if verbose:
-        flags.append('--verbose')
-    if yes:
-        flags.append('--yes')
-    if fallback_symlink:
-        flags.append('--fallback-symlink')
-    if log_path:
-        flags.append(f'--log {log_path}')
-    if target_dir:
-        flags.append(f'--target-dir {target_dir}')
-    return flags
+    optional_flags = (
+        ('--verbose', verbose),
+        ('--yes', yes),
+        ('--fallback-symlink', fallback_symlink),
+        (f'--log {log_path}', log_path),
+        (f'--target-dir {target_dir}', target_dir),
+        (f'--jobs {jobs}', jobs > 1),
+    )
+    return [*base_flags, *(flag for flag, enabled in optional_flags if enabled)]
 
 
 def _validate_args(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
@@ -347,6 +407,17 @@ def _validate_args(args: argparse.Namespace, parser: argparse.ArgumentParser) ->
         parser.error("--log requires --execute")
     if args.fallback_symlink and args.action != Action.HARDLINK:
         parser.error("--fallback-symlink only applies to --action hardlink")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.hash != 'auto':
+        try:
+            create_hasher(args.hash)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.max_errors_shown < 0:
+        parser.error("--max-errors-shown must be 0 or more")
     if args.target_dir:
         if args.action not in (Action.HARDLINK, Action.SYMLINK):
             parser.error("--target-dir only applies to --action hardlink or --action symlink")
@@ -370,6 +441,7 @@ def _setup_logging(args: argparse.Namespace) -> logging.Handler:
     # Clear and set to ensure correct output stream (especially important across test runs)
     for log in [logger,
                 logging.getLogger('filematcher.directory'),
+                logging.getLogger('filematcher.cache'),
                 logging.getLogger('filematcher.cli')]:
         log.handlers.clear()
         log.addHandler(handler)
@@ -381,7 +453,10 @@ def _setup_logging(args: argparse.Namespace) -> logging.Handler:
 def _build_master_results(
     matches: dict[str, tuple[list[str], list[str]]],
     master_path: Path,
-    action: Action
+    action: Action,
+    device_ids: dict[str, int] | None = None,
+    known_mtimes: dict[str, float] | None = None,
+    known_inodes: dict[str, int] | None = None
 ) -> tuple[list[DuplicateGroup], set[str], list[str], int]:
     """Build master results from matches, detecting cross-filesystem files and hardlinked duplicates.
 
@@ -389,6 +464,9 @@ def _build_master_results(
         matches: Dict mapping hash -> (files_in_dir1, files_in_dir2)
         master_path: Path to master directory
         action: Action being performed (affects cross-fs detection)
+        device_ids: Optional path -> st_dev map recorded during the scan
+        known_mtimes: Optional path -> st_mtime map recorded during the scan
+        known_inodes: Optional path -> st_ino map recorded during the scan
 
     Returns:
         Tuple of (master_results, cross_fs_files, warnings, total_already_hardlinked)
@@ -397,30 +475,33 @@ def _build_master_results(
     warnings: list[str] = []
     total_already_hardlinked = 0
     master_dir_str = str(master_path)
+    # Separator-terminated once here so the per-file test is a single startswith
+    master_prefix = master_dir_str.rstrip(os.sep) + os.sep
+    # Cross-filesystem detection stats every file, so only do it when hardlinking
+    cross_fs_files: set[str] = set()
+    detect_cross_fs = action == Action.HARDLINK
 
     for file_hash, (files1, files2) in matches.items():
         all_files = files1 + files2
 
-        master_files_in_group = [f for f in all_files if is_in_directory(f, master_dir_str)]
+        master_files_in_group = [f for f in all_files if f.startswith(master_prefix)]
         if len(master_files_in_group) > 1:
             warnings.append(f"Warning: Multiple files in master directory have identical content: {', '.join(master_files_in_group)}")
 
-        master_file, duplicates, reason = select_master_file(all_files, master_path)
-        actionable_dups, hardlinked_dups = filter_hardlinked_duplicates(master_file, duplicates)
+        master_file, duplicates, reason = select_master_file(all_files, master_path, known_mtimes)
+        actionable_dups, hardlinked_dups = filter_hardlinked_duplicates(master_file, duplicates, device_ids, known_inodes)
         total_already_hardlinked += len(hardlinked_dups)
 
         if actionable_dups:
+            # Sort once here so formatters can skip re-sorting (presorted=True)
+            actionable_dups.sort()
             master_results.append(DuplicateGroup(master_file, actionable_dups, reason, file_hash))
+            if detect_cross_fs:
+                cross_fs_files.update(check_cross_filesystem(master_file, actionable_dups, device_ids))
 
     if total_already_hardlinked > 0:
         logger.info(f"Skipped {total_already_hardlinked} files already hardlinked to master (no space savings)")
 
-    # Detect cross-filesystem files for hardlink action
-    cross_fs_files: set[str] = set()
-    if action == Action.HARDLINK:
-        for master_file, duplicates, reason, _ in master_results:
-            cross_fs_files.update(check_cross_filesystem(master_file, duplicates))
-
     return master_results, cross_fs_files, warnings, total_already_hardlinked
 
 
@@ -429,13 +510,13 @@ def execute_with_logging(
     dir2: str,
     action: Action,
     master_results: list[DuplicateGroup],
-    matches: dict[str, tuple[list[str], list[str]]],
     base_flags: list[str],
     verbose: bool = False,
     yes: bool = False,
     fallback_symlink: bool = False,
     log_path: str | None = None,
     target_dir: str | None = None,
+    jobs: int = 1,
 ) -> tuple[int, int, int, int, list[str], Path]:
     """Execute actions with audit logging and return results."""
     log_path_obj = Path(log_path) if log_path else None
@@ -447,21 +528,22 @@ def execute_with_logging(
         yes=yes,
         fallback_symlink=fallback_symlink,
         log_path=log_path,
-        target_dir=target_dir
+        target_dir=target_dir,
+        jobs=jobs
     )
 
     write_log_header(audit_logger, dir1, dir2, dir1, action, flags)
-    file_hash_lookup = build_file_hash_lookup(matches)
 
+    # Each DuplicateGroup carries its content hash, so no per-file lookup is needed
     success_count, failure_count, skipped_count, space_saved, failed_list = execute_all_actions(
         master_results,
         action,
         fallback_symlink=fallback_symlink,
         verbose=verbose,
         audit_logger=audit_logger,
-        file_hashes=file_hash_lookup,
         target_dir=target_dir,
-        dir2_base=dir2
+        dir2_base=dir2,
+        jobs=jobs
     )
 
     write_log_footer(audit_logger, success_count, failure_count, skipped_count, space_saved, failed_list)
@@ -486,12 +568,22 @@ def _print_preview_output(
     verbose: bool,
     json_mode: bool,
     target_dir: str | None,
-    show_banner: bool = True
+    show_banner: bool = True,
+    known_sizes: dict[str, int] | None = None
 ) -> None:
     """Print preview output for compare/preview modes."""
-    matched_files1 = sum(len(files) for files, _ in matches.values())
-    matched_files2 = sum(len(files) for _, files in matches.values())
-    space_info = calculate_space_savings(master_results)
+    # Sizes shown per group double as master sizes for the space calculation
+    file_sizes = None
+    if (verbose or json_mode) and not summary and matches:
+        file_sizes = build_file_sizes(
+            [path for group in master_results for path in (group.master_file, *group.duplicates)], known_sizes
+        )
+
+    cross_fs_to_show = get_cross_fs_for_hardlink(action, cross_fs_files)
+    # Without per-group sizes to show, master sizes still come from the scan, not a stat
+    space_info = calculate_space_savings(
+        master_results, cross_fs_to_show, file_sizes if file_sizes is not None else known_sizes
+    )
 
     if show_banner:
         formatter.format_banner(
@@ -503,26 +595,28 @@ def _print_preview_output(
 
     if summary:
         if action == Action.COMPARE:
+            compare_stats = calculate_compare_stats(matches, unmatched1, unmatched2)
             formatter.format_compare_summary(
-                match_count=len(matches),
-                matched_files1=matched_files1,
-                matched_files2=matched_files2,
+                match_count=compare_stats.match_count,
+                matched_files1=compare_stats.matched_files1,
+                matched_files2=compare_stats.matched_files2,
                 dir1_name=dir1,
                 dir2_name=dir2
             )
             if show_unmatched and not json_mode:
-                print(f"\nUnmatched files summary:")
-                print(f"  Files in {dir1} with no match: {len(unmatched1)}")
-                print(f"  Files in {dir2} with no match: {len(unmatched2)}")
+                sys.stdout.write(
+                    "\nUnmatched files summary:\n"
+                    f"  Files in {dir1} with no match: {compare_stats.unmatched_count1}\n"
+                    f"  Files in {dir2} with no match: {compare_stats.unmatched_count2}\n"
+                )
         else:
-            cross_fs_count = get_cross_fs_count(action, cross_fs_files)
             formatter.format_statistics(
                 group_count=space_info.group_count,
                 duplicate_count=space_info.duplicate_count,
                 master_count=len(master_results),
                 space_savings=space_info.bytes_saved,
                 action=action,
-                cross_fs_count=cross_fs_count
+                cross_fs_count=space_info.cross_fs_count
             )
     else:
         if not matches:
@@ -531,30 +625,32 @@ def _print_preview_output(
             formatter.format_warnings(warnings)
 
             sorted_results = sorted(master_results, key=lambda x: x[0])
+            total_groups = len(sorted_results)
+            # Piped text output gets a blank line between groups; written directly, as
+            # print() costs a call with its own argument handling for every group
+            separate_groups = not json_mode and not color_config.is_tty
+            write = sys.stdout.write
+
+            with _block_buffered_stdout():
+                for i, (master_file, duplicates, reason, file_hash) in enumerate(sorted_results):
+                    formatter.format_duplicate_group(
+                        master_file, duplicates,
+                        action=action,
+                        file_hash=file_hash,
+                        file_sizes=file_sizes,
+                        cross_fs_files=cross_fs_to_show,
+                        group_index=i + 1,
+                        total_groups=total_groups,
+                        target_dir=target_dir,
+                        dir2_base=dir2,
+                        presorted=True
+                    )
 
-            for i, (master_file, duplicates, reason, file_hash) in enumerate(sorted_results):
-                file_sizes = None
-                if verbose or json_mode:
-                    file_sizes = build_file_sizes([master_file] + duplicates)
-
-                cross_fs_to_show = get_cross_fs_for_hardlink(action, cross_fs_files)
-                formatter.format_duplicate_group(
-                    master_file, duplicates,
-                    action=action,
-                    file_hash=file_hash,
-                    file_sizes=file_sizes,
-                    cross_fs_files=cross_fs_to_show,
-                    group_index=i + 1,
-                    total_groups=len(sorted_results),
-                    target_dir=target_dir,
-                    dir2_base=dir2
-                )
-
-                if i < len(sorted_results) - 1 and not json_mode and not color_config.is_tty:
-                    print()
+                    if separate_groups and i < total_groups - 1:
+                        write("\n")
 
-            if color_config.is_tty:
-                print()
+                if color_config.is_tty:
+                    write("\n")
 
         if show_unmatched and action == Action.COMPARE:
             formatter.format_unmatched_section(
@@ -565,24 +661,23 @@ def _print_preview_output(
             )
 
         if matches:
-            cross_fs_count = get_cross_fs_count(action, cross_fs_files)
             formatter.format_statistics(
                 group_count=space_info.group_count,
                 duplicate_count=space_info.duplicate_count,
                 master_count=len(master_results),
                 space_savings=space_info.bytes_saved,
                 action=action,
-                cross_fs_count=cross_fs_count
+                cross_fs_count=space_info.cross_fs_count
             )
 
 
 def _execute_json_batch(
     args: argparse.Namespace,
     master_results: list[DuplicateGroup],
-    matches: dict[str, tuple[list[str], list[str]]],
     cross_fs_files: set[str],
     action_formatter: JsonActionFormatter,
-    color_config: ColorConfig
+    color_config: ColorConfig,
+    known_sizes: dict[str, int] | None = None
 ) -> int:
     """Execute in JSON mode with --yes flag (batch mode)."""
     success_count, failure_count, skipped_count, space_saved, failed_list, actual_log_path = execute_with_logging(
@@ -590,18 +685,22 @@ def _execute_json_batch(
         dir2=args.dir2,
         action=args.action,
         master_results=master_results,
-        matches=matches,
         base_flags=['--execute', '--json', '--yes'],
         verbose=args.verbose,
         fallback_symlink=args.fallback_symlink,
         log_path=args.log,
-        target_dir=args.target_dir
+        target_dir=args.target_dir,
+        jobs=args.jobs
+    )
+
+    file_sizes = build_file_sizes(
+        [path for group in master_results for path in (group.master_file, *group.duplicates)], known_sizes
     )
 
+    cross_fs_to_show = get_cross_fs_for_hardlink(args.action, cross_fs_files)
     sorted_results = sorted(master_results, key=lambda x: x[0])
+    total_groups = len(sorted_results)
     for i, (master_file, duplicates, reason, file_hash) in enumerate(sorted_results):
-        file_sizes = build_file_sizes([master_file] + duplicates)
-        cross_fs_to_show = get_cross_fs_for_hardlink(args.action, cross_fs_files)
         action_formatter.format_duplicate_group(
             master_file, duplicates,
             action=args.action,
@@ -609,23 +708,23 @@ def _execute_json_batch(
             file_sizes=file_sizes,
             cross_fs_files=cross_fs_to_show,
             group_index=i + 1,
-            total_groups=len(sorted_results),
+            total_groups=total_groups,
             target_dir=args.target_dir,
-            dir2_base=args.dir2
+            dir2_base=args.dir2,
+            presorted=True
         )
 
     if color_config.is_tty:
         print()
 
-    preview_space_info = calculate_space_savings(master_results)
-    cross_fs_count = get_cross_fs_count(args.action, cross_fs_files)
+    preview_space_info = calculate_space_savings(master_results, cross_fs_to_show, file_sizes)
     action_formatter.format_statistics(
         group_count=preview_space_info.group_count,
         duplicate_count=preview_space_info.duplicate_count,
         master_count=len(master_results),
         space_savings=preview_space_info.bytes_saved,
         action=args.action,
-        cross_fs_count=cross_fs_count
+        cross_fs_count=preview_space_info.cross_fs_count
     )
 
     action_formatter.format_execution_summary(
@@ -648,7 +747,6 @@ def _execute_json_batch(
 def _execute_text_batch(
     args: argparse.Namespace,
     master_results: list[DuplicateGroup],
-    matches: dict[str, tuple[list[str], list[str]]],
     color_config: ColorConfig
 ) -> int:
     """Execute in text mode with --yes flag (batch mode, no prompts)."""
@@ -657,20 +755,21 @@ def _execute_text_batch(
         dir2=args.dir2,
         action=args.action,
         master_results=master_results,
-        matches=matches,
         base_flags=['--execute', '--yes'],
         verbose=args.verbose,
         yes=args.yes,
         fallback_symlink=args.fallback_symlink,
         log_path=args.log,
-        target_dir=args.target_dir
+        target_dir=args.target_dir,
+        jobs=args.jobs
     )
 
     action_formatter_exec = TextActionFormatter(
         verbose=args.verbose,
         preview_mode=False,
         action=args.action,
-        color_config=color_config
+        color_config=color_config,
+        max_errors_shown=args.max_errors_shown
     )
     action_formatter_exec.format_execution_summary(
         success_count=success_count,
@@ -691,15 +790,14 @@ def _execute_text_batch(
 def _execute_interactive_mode(
     args: argparse.Namespace,
     master_results: list[DuplicateGroup],
-    matches: dict[str, tuple[list[str], list[str]]],
     cross_fs_files: set[str],
-    action_formatter: TextActionFormatter
+    action_formatter: TextActionFormatter,
+    known_sizes: dict[str, int] | None = None
 ) -> int:
     """Execute in interactive mode - prompt for each group."""
-    file_hash_lookup = build_file_hash_lookup(matches)
     file_sizes_map: dict[str, dict[str, int]] = {}
     for master_file, duplicates, reason, file_hash in master_results:
-        file_sizes_map[master_file] = build_file_sizes([master_file] + duplicates)
+        file_sizes_map[master_file] = build_file_sizes([master_file] + duplicates, known_sizes)
 
     cross_fs_to_show = get_cross_fs_for_hardlink(args.action, cross_fs_files)
 
@@ -721,7 +819,6 @@ def _execute_interactive_mode(
         formatter=action_formatter,
         fallback_symlink=args.fallback_symlink,
         audit_logger=audit_logger,
-        file_hashes=file_hash_lookup,
         target_dir=args.target_dir,
         dir2_base=args.dir2,
         verbose=args.verbose,
@@ -766,8 +863,9 @@ def main() -> int:
     parser.add_argument('dir1', help='First directory to compare')
     parser.add_argument('dir2', help='Second directory to compare')
     parser.add_argument('--show-unmatched', '-u', action='store_true', help='Display files with no content match')
-    parser.add_argument('--hash', '-H', choices=['md5', 'sha256'], default='md5',
-                        help='Hash algorithm to use (default: md5)')
+    parser.add_argument('--hash', '-H', choices=['auto', 'blake2b', 'blake3', 'md5', 'sha256'], default='auto',
+                        help='Hash algorithm to use (default: auto, which picks blake3 if the blake3 package is '
+                             'installed, else sha256 on CPUs with SHA instructions, else blake2b; md5 kept for compatibility)')
     parser.add_argument('--summary', '-s', action='store_true',
                         help='Show only counts of matched/unmatched files instead of listing them all')
     parser.add_argument('--fast', '-f', action='store_true',
@@ -787,6 +885,14 @@ def main() -> int:
                         help='Use symlink instead of hardlink for cross-filesystem duplicates')
     parser.add_argument('--target-dir', '-t', type=str, metavar='PATH',
                         help='Create links in this directory instead of in-place (dir2 files deleted after linking)')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 1, metavar='N',
+                        help='Processes used to hash files in large directories (default: CPU count)')
+    parser.add_argument('--cache', type=str, metavar='FILE',
+                        help='Keep file hashes in this SQLite file and reuse them for files whose size and mtime are unchanged')
+    parser.add_argument('--jobs', '-J', type=int, default=1, metavar='N',
+                        help='Run up to N link/delete operations in parallel with --yes (default: 1; keep 1 on network filesystems)')
+    parser.add_argument('--max-errors-shown', type=int, default=DEFAULT_MAX_ERRORS_SHOWN, metavar='N',
+                        help=f'List at most N failed files in the execution summary, 0 for all (default: {DEFAULT_MAX_ERRORS_SHOWN})')
     parser.add_argument('--different-names-only', '-d', action='store_true',
                         help='Only report files with identical content but different names (exclude same-name matches)')
     parser.add_argument('--json', '-j', action='store_true',
@@ -818,8 +924,14 @@ def main() -> int:
         logger.error("Error: Both arguments must be directories")
         return 1
 
-    hash_algo = args.hash
+    hash_algo = resolve_hash_algorithm(args.hash)
     logger.info(f"Using {hash_algo.upper()} hashing algorithm")
+    if hash_algo == 'sha256':
+        sha_extensions = cpu_has_sha_extensions()
+        if sha_extensions:
+            logger.info("Using hardware-accelerated SHA-256 (CPU SHA extensions)")
+        elif sha_extensions is False and not args.fast:
+            logger.info("CPU lacks SHA instructions: --hash blake2b or --fast will hash considerably faster")
 
     if args.fast:
         logger.info("Fast mode enabled: Using sparse sampling for large files")
@@ -827,14 +939,24 @@ def main() -> int:
     if args.verbose:
         logger.info("Verbose mode enabled: Showing progress for each file")
 
-    matches, unmatched1, unmatched2 = find_matching_files(args.dir1, args.dir2, hash_algo, args.fast, args.verbose, args.different_names_only)
-
-    matched_files1 = sum(len(files) for files, _ in matches.values())
-    matched_files2 = sum(len(files) for _, files in matches.values())
+    # Device IDs, sizes, mtimes and inodes come free with the scan's stat; reusing them spares
+    # a second stat per file in cross-filesystem and hardlink checks, master selection and
+    # size display
+    device_ids: dict[str, int] = {}
+    scanned_sizes: dict[str, int] = {}
+    scanned_mtimes: dict[str, float] = {}
+    scanned_inodes: dict[str, int] = {}
+    cache = _open_hash_cache(args.cache, hash_algo, args.fast) if args.cache else None
+    with cache if cache is not None else contextlib.nullcontext():
+        matches, unmatched1, unmatched2 = find_matching_files(
+            args.dir1, args.dir2, hash_algo, args.fast, args.verbose, args.different_names_only, device_ids,
+            workers=args.workers, file_sizes=scanned_sizes, mtimes=scanned_mtimes, cache=cache,
+            inodes=scanned_inodes
+        )
 
     if master_path:
         master_results, cross_fs_files, warnings, _ = _build_master_results(
-            matches, master_path, args.action
+            matches, master_path, args.action, device_ids, scanned_mtimes, scanned_inodes
         )
 
         preview_mode = not args.execute
@@ -854,7 +976,8 @@ def main() -> int:
                 preview_mode=True,
                 action=args.action,
                 color_config=color_config,
-                will_execute=args.execute
+                will_execute=args.execute,
+                max_errors_shown=args.max_errors_shown
             )
 
         if preview_mode:
@@ -875,19 +998,20 @@ def main() -> int:
                 verbose=args.verbose,
                 json_mode=args.json,
                 target_dir=args.target_dir,
-                show_banner=True
+                show_banner=True,
+                known_sizes=scanned_sizes
             )
             action_formatter.finalize()
 
         elif execute_mode:
             if args.json:
                 return _execute_json_batch(
-                    args, master_results, matches, cross_fs_files,
-                    action_formatter, color_config
+                    args, master_results, cross_fs_files,
+                    action_formatter, color_config, scanned_sizes
                 )
             else:
                 # Text mode: show banner for both interactive and batch modes
-                space_info = calculate_space_savings(master_results)
+                space_info = calculate_space_savings(master_results, file_sizes=scanned_sizes)
 
                 if not args.quiet:
                     action_formatter.format_banner(
@@ -898,10 +1022,10 @@ def main() -> int:
                     )
 
                 if args.yes:
-                    return _execute_text_batch(args, master_results, matches, color_config)
+                    return _execute_text_batch(args, master_results, color_config)
                 else:
                     return _execute_interactive_mode(
-                        args, master_results, matches, cross_fs_files, action_formatter
+                        args, master_results, cross_fs_files, action_formatter, scanned_sizes
                     )
 
     return 0
@@ -2,28 +2,55 @@
 
 from __future__ import annotations
 
+import contextlib
 import logging
 import os
 import shutil
 import sys
-from collections import defaultdict
+import time
+from collections.abc import Iterator
+from itertools import chain, repeat
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from filematcher.hashing import get_file_hash
+from filematcher.hashing import HEAD_HASH_SIZE, LARGE_FILE_THRESHOLD, get_file_hash, get_head_hash
 from filematcher.actions import format_file_size
-from filematcher.filesystem import is_in_directory
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from filematcher.cache import HashCache
 
 logger = logging.getLogger(__name__)
 
+PARALLEL_HASH_MIN_FILES = 64  # below this, starting worker processes costs more than it saves
+PARALLEL_HASH_CHUNK_SIZE = 32  # files handed to a worker per round trip
+PREFETCH_DEPTH = 8  # files ahead of the one being hashed that the kernel is asked to start reading
+PREFETCH_MAX_BYTES = 8 * 1024 * 1024  # 8 MB - readahead requested per prefetched file
+PREFETCH_MIN_SIZE = 64 * 1024  # 64 KB - smaller files are not worth the extra open to prefetch
+# 128 KB - below this a full hash costs at most twice a head hash, and the head pass
+# would add a second open and read for every file that does turn out to match
+HEAD_FILTER_MIN_SIZE = 2 * HEAD_HASH_SIZE
+PROGRESS_INTERVAL = 0.1  # seconds - minimum time between redraws of the inline progress line
+READ_THREADS_PER_WORKER = 4  # head hashes wait on the disk, not the CPU, so several per core help
+MAX_READ_THREADS = 32
+
 
-def select_oldest(file_paths: list[str]) -> tuple[str, list[str]]:
-    """Select the oldest file by mtime and return it with remaining files."""
-    oldest = min(file_paths, key=lambda p: os.path.getmtime(p))
-    others = [f for f in file_paths if f != oldest]
-    return oldest, others
+def select_oldest(file_paths: list[str], known_mtimes: dict[str, float] | None = None) -> tuple[str, list[str]]:
+    """Select the oldest file by mtime and return it with remaining files.
+
+    mtimes found in known_mtimes (e.g. from the directory scan) are used without a stat.
+    """
+    # Stat each file at most once; ties go to the earliest path, as with min()
+    if known_mtimes:
+        mtimes = [known_mtimes[p] if p in known_mtimes else os.path.getmtime(p) for p in file_paths]
+    else:
+        mtimes = [os.path.getmtime(p) for p in file_paths]
+    oldest_index = min(range(len(file_paths)), key=mtimes.__getitem__)
+    return file_paths[oldest_index], file_paths[:oldest_index] + file_paths[oldest_index + 1:]
 
 
-def select_master_file(file_paths: list[str], master_dir: Path | None) -> tuple[str, list[str], str]:
+def select_master_file(file_paths: list[str], master_dir: Path | None, known_mtimes: dict[str, float] | None = None) -> tuple[str, list[str], str]:
     """Select master file from duplicates, preferring files in master_dir, then oldest by mtime."""
     if not file_paths:
         raise ValueError("file_paths cannot be empty")
@@ -33,100 +60,487 @@ def select_master_file(file_paths: list[str], master_dir: Path | None) -> tuple[
 
     if master_dir:
         master_dir_str = str(master_dir)
-        master_files = [f for f in file_paths if is_in_directory(f, master_dir_str)]
-        other_files = [f for f in file_paths if f not in master_files]
+        prefix = master_dir_str if master_dir_str.endswith(os.sep) else master_dir_str + os.sep
+        # Single pass partition; the separator-terminated prefix rejects /master2 for /master
+        master_files: list[str] = []
+        other_files: list[str] = []
+        for f in file_paths:
+            if f == master_dir_str or f.startswith(prefix):
+                master_files.append(f)
+            else:
+                other_files.append(f)
 
         if master_files:
             if len(master_files) == 1:
                 return master_files[0], other_files, "only file in master directory"
             else:
-                oldest_master, other_master_files = select_oldest(master_files)
+                oldest_master, other_master_files = select_oldest(master_files, known_mtimes)
                 return oldest_master, other_master_files + other_files, "oldest in master directory"
         else:
-            oldest, duplicates = select_oldest(file_paths)
+            oldest, duplicates = select_oldest(file_paths, known_mtimes)
             return oldest, duplicates, "oldest file (none in master directory)"
     else:
-        oldest, duplicates = select_oldest(file_paths)
+        oldest, duplicates = select_oldest(file_paths, known_mtimes)
         return oldest, duplicates, "oldest file"
 
 
-def index_directory(directory: str | Path, hash_algorithm: str = 'md5', fast_mode: bool = False, verbose: bool = False) -> dict[str, list[str]]:
-    """Recursively index all files in a directory. Returns dict mapping hash -> list of paths."""
-    hash_to_files = defaultdict(list)
-    directory_path = Path(directory)
+def _hash_file(filepath: str, hash_algorithm: str, fast_mode: bool, file_size: int) -> tuple[bytes | None, str]:
+    """Hash one file for indexing; runs in worker processes too. Returns (raw digest or None, error)."""
+    try:
+        return get_file_hash(filepath, hash_algorithm, fast_mode, file_size=file_size, raw=True), ""
+    except OSError as e:
+        return None, str(e)
+
+
+def _hash_head(filepath: str, hash_algorithm: str, fast_mode: bool, file_size: int) -> tuple[bytes | None, str]:
+    """Hash a file's first HEAD_HASH_SIZE bytes; same signature and result shape as _hash_file."""
+    try:
+        return get_head_hash(filepath, hash_algorithm, file_size=file_size, raw=True), ""
+    except OSError as e:
+        return None, str(e)
+
+
+def _prefetch(filepath: str, file_size: int) -> None:
+    """Ask the kernel to start reading a file in the background; best effort."""
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, min(file_size, PREFETCH_MAX_BYTES), os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _hash_serially(
+    paths: list[str], sizes: list[int], hash_algorithm: str, fast_mode: bool, head_only: bool = False
+) -> Iterator[tuple[bytes | None, str]]:
+    """Hash files in order while the next PREFETCH_DEPTH files are read ahead.
+
+    Keeps several reads queued at the device instead of one at a time. Files below
+    PREFETCH_MIN_SIZE are not worth an extra open, and in fast mode large files are only
+    sampled, so reading their start ahead would be wasted.
+    """
+    hash_one = _hash_head if head_only else _hash_file
+    if head_only or not hasattr(os, 'posix_fadvise'):
+        # Head hashes read too little for readahead to pay for the extra open
+        yield from map(hash_one, paths, repeat(hash_algorithm), repeat(fast_mode), sizes)
+        return
+
+    def worth_prefetching(size: int) -> bool:
+        return size >= PREFETCH_MIN_SIZE and not (fast_mode and size >= LARGE_FILE_THRESHOLD)
+
+    total = len(paths)
+    for i in range(1, min(PREFETCH_DEPTH, total)):
+        if worth_prefetching(sizes[i]):
+            _prefetch(paths[i], sizes[i])
+    for i, (path, size) in enumerate(zip(paths, sizes)):
+        ahead = i + PREFETCH_DEPTH
+        if ahead < total and worth_prefetching(sizes[ahead]):
+            _prefetch(paths[ahead], sizes[ahead])
+        yield _hash_file(path, hash_algorithm, fast_mode, size)
+
+
+def scan_files(directory: str | Path) -> list[tuple[str, os.stat_result]]:
+    """Recursively list regular files under directory with the stat result of each.
+
+    Walks with os.scandir so directory entries come with their type and only
+    files need a stat. Symlinked directories are not descended into; symlinks
+    to regular files are listed, as with Path.rglob.
+
+    Returned paths are canonical strings: the root is resolved once and child paths
+    are built from it, so only symlinked files need resolving.
+    """
+    files = []
+    pending = [os.path.realpath(directory)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    try:
+                        # Regular files, the bulk of any tree, are settled by the listing's
+                        # type with one check before their stat
+                        if entry.is_file(follow_symlinks=False):
+                            files.append((entry.path, entry.stat(follow_symlinks=False)))
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                            continue
+                        # Sockets, FIFOs and devices are skipped without a stat; for symlinks
+                        # is_file() stats the target and entry.stat() reuses it
+                        if not entry.is_symlink() or not entry.is_file():
+                            continue
+                        file_stat = entry.stat()
+                    except OSError:
+                        continue
+                    files.append((os.path.realpath(entry.path), file_stat))
+        except OSError:
+            continue
+    return files
+
 
+def _scan_both(dir1: str | Path, dir2: str | Path, workers: int) -> tuple[list[tuple[str, os.stat_result]], list[tuple[str, os.stat_result]]]:
+    """Walk both directories, concurrently unless a single worker was asked for.
+
+    The walk is almost all scandir/stat syscalls, which release the GIL, so a
+    second thread lets the two trees' metadata reads overlap.
+    """
+    if workers < 2:
+        return scan_files(dir1), scan_files(dir2)
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        future2 = pool.submit(scan_files, dir2)
+        files1 = scan_files(dir1)
+        return files1, future2.result()
+
+
+def _start_hash_pool(workers: int) -> Executor:
+    # Deferred: the process pool machinery is only loaded for parallel runs
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _start_read_pool(workers: int) -> Executor:
+    # Threads rather than processes: no worker startup or result pickling for I/O-bound reads
+    from concurrent.futures import ThreadPoolExecutor
+
+    return ThreadPoolExecutor(max_workers=min(MAX_READ_THREADS, workers * READ_THREADS_PER_WORKER))
+
+
+def hash_files(
+    files: list[tuple[str, os.stat_result]],
+    hash_algorithm: str = 'md5',
+    fast_mode: bool = False,
+    verbose: bool = False,
+    workers: int = 1,
+    executor: Executor | None = None,
+    head_only: bool = False
+) -> Iterator[tuple[str, os.stat_result, bytes]]:
+    """Hash scanned files, yielding (path, stat, raw digest) in input order; unreadable files are logged and skipped.
+
+    With workers > 1 and at least PARALLEL_HASH_MIN_FILES files, hashing runs in a process pool:
+    executor if given, otherwise one started for this call. head_only hashes just the
+    first HEAD_HASH_SIZE bytes of each file.
+    """
+    total_files = len(files)
+    processed_files = 0
     if verbose:
-        total_files = sum(1 for filepath in directory_path.rglob('*') if filepath.is_file())
-        processed_files = 0
-        logger.debug(f"Found {total_files} files to process in {directory}")
+        # The head pass gets its own label so it is not mistaken for the full hashing
+        label = "Checking head of" if head_only else "Processing"
         is_tty = hasattr(sys.stderr, 'isatty') and sys.stderr.isatty()
+        # Queried once: asking the terminal per file costs an ioctl each time
+        term_width = shutil.get_terminal_size().columns if is_tty else 0
+        # The inline line is redrawn at most every PROGRESS_INTERVAL: a write and flush
+        # per file would cost more than hashing a small file
+        next_redraw = 0.0
+
+    paths = [filepath for filepath, _ in files]
+    sizes = [file_stat.st_size for _, file_stat in files]
+
+    with contextlib.ExitStack() as stack:
+        if workers > 1 and total_files >= PARALLEL_HASH_MIN_FILES:
+            if executor is None:
+                executor = stack.enter_context(_start_hash_pool(workers))
+            results = executor.map(
+                _hash_head if head_only else _hash_file, paths, repeat(hash_algorithm), repeat(fast_mode), sizes, chunksize=PARALLEL_HASH_CHUNK_SIZE
+            )
+        else:
+            results = _hash_serially(paths, sizes, hash_algorithm, fast_mode, head_only)
 
-    for filepath in directory_path.rglob('*'):
-        if filepath.is_file():
-            try:
-                if verbose:
-                    processed_files += 1
-                    file_size = os.path.getsize(filepath)
-                    size_str = format_file_size(file_size)
-                    if is_tty:
-                        progress_line = f"\r[{processed_files}/{total_files}] Processing {filepath.name} ({size_str})"
-                        term_width = shutil.get_terminal_size().columns
+        for (filepath, file_stat), (file_hash, error) in zip(files, results):
+            if verbose:
+                processed_files += 1
+                if is_tty:
+                    now = time.monotonic()
+                    if now >= next_redraw or processed_files == total_files:
+                        next_redraw = now + PROGRESS_INTERVAL
+                        size_str = format_file_size(file_stat.st_size)
+                        progress_line = f"\r[{processed_files}/{total_files}] {label} {os.path.basename(filepath)} ({size_str})"
                         if len(progress_line) > term_width:
                             progress_line = progress_line[:term_width-3] + "..."
                         sys.stderr.write(progress_line.ljust(term_width) + '\r')
                         sys.stderr.flush()
-                    else:
-                        logger.debug(f"[{processed_files}/{total_files}] Processing {filepath.name} ({size_str})")
+                else:
+                    size_str = format_file_size(file_stat.st_size)
+                    logger.debug(f"[{processed_files}/{total_files}] {label} {os.path.basename(filepath)} ({size_str})")
+
+            if file_hash is None:
+                logger.error(f"Error processing {filepath}: {error}")
+                continue
+            yield filepath, file_stat, file_hash
+
+    if verbose and is_tty:
+        sys.stderr.write('\r' + ' ' * term_width + '\r')
+        sys.stderr.flush()
+
 
-                file_hash = get_file_hash(filepath, hash_algorithm, fast_mode)
-                hash_to_files[file_hash].append(str(filepath.resolve()))
-            except (PermissionError, OSError) as e:
-                logger.error(f"Error processing {filepath}: {e}")
-                if verbose:
-                    processed_files += 1
+def _index_files(
+    files: list[tuple[str, os.stat_result]],
+    hash_algorithm: str,
+    fast_mode: bool,
+    verbose: bool,
+    device_ids: dict[str, int] | None,
+    workers: int,
+    file_sizes: dict[str, int] | None = None,
+    executor: Executor | None = None,
+    mtimes: dict[str, float] | None = None,
+    cache: HashCache | None = None,
+    inodes: dict[str, int] | None = None
+) -> dict[bytes, list[str]]:
+    """Hash scanned files into a dict mapping raw digest -> list of resolved paths.
+
+    Raw digests are half the size of hex strings, cheaper to hash and compare, and
+    cheaper to pickle back from worker processes; callers hex-encode at their boundary.
+    With a cache, files whose size and mtime are unchanged reuse their cached digest.
+    """
+    if cache is None:
+        hashed = list(hash_files(files, hash_algorithm, fast_mode, verbose, workers, executor))
+    else:
+        digests = {}
+        misses = []
+        for path, file_stat in files:
+            digest = cache.get(file_stat)
+            if digest is None:
+                misses.append((path, file_stat))
+            else:
+                digests[path] = digest
+        if verbose:
+            logger.debug(f"Hash cache: {len(digests)} of {len(files)} files unchanged")
+        for path, file_stat, digest in hash_files(misses, hash_algorithm, fast_mode, verbose, workers, executor):
+            cache.put(file_stat, digest)
+            digests[path] = digest
+        # Kept in scan order, as without a cache; unreadable files have no digest
+        hashed = [(path, file_stat, digests[path]) for path, file_stat in files if path in digests]
+    hash_to_files: dict[bytes, list[str]] = {}
+    # Most digests are unique; a bound setdefault beats defaultdict's missing-key path there
+    setdefault = hash_to_files.setdefault
+    for path, _, digest in hashed:
+        setdefault(digest, []).append(path)
+    # Filled per requested dict rather than testing all three for None on every file
+    if device_ids is not None:
+        device_ids.update((path, file_stat.st_dev) for path, file_stat, _ in hashed)
+    if file_sizes is not None:
+        file_sizes.update((path, file_stat.st_size) for path, file_stat, _ in hashed)
+    if mtimes is not None:
+        mtimes.update((path, file_stat.st_mtime) for path, file_stat, _ in hashed)
+    if inodes is not None:
+        inodes.update((path, file_stat.st_ino) for path, file_stat, _ in hashed)
+    return hash_to_files
+
+
+def index_directory(directory: str | Path, hash_algorithm: str = 'md5', fast_mode: bool = False, verbose: bool = False, device_ids: dict[str, int] | None = None, workers: int = 1, file_sizes: dict[str, int] | None = None, mtimes: dict[str, float] | None = None, cache: HashCache | None = None, files: list[tuple[str, os.stat_result]] | None = None, inodes: dict[str, int] | None = None) -> dict[str, list[str]]:
+    """Recursively index all files in a directory. Returns dict mapping hash -> list of paths.
+
+    If device_ids, file_sizes, mtimes or inodes is given, it is filled with resolved path ->
+    st_dev, st_size, st_mtime or st_ino from the stat the walk already does. A HashCache, if given, supplies
+    digests for unchanged files and records the rest. files, if given, is a scan_files()
+    result (possibly filtered, e.g. to sizes that occur elsewhere) hashed instead of walking
+    directory again.
+    """
+    if files is None:
+        files = scan_files(directory)
+    if verbose:
+        logger.debug(f"Found {len(files)} files to process in {directory}")
+
+    hash_to_files = _index_files(
+        files, hash_algorithm, fast_mode, verbose, device_ids, workers, file_sizes, mtimes=mtimes, cache=cache, inodes=inodes
+    )
 
     if verbose:
-        if is_tty:
-            sys.stderr.write('\r' + ' ' * shutil.get_terminal_size().columns + '\r')
-            sys.stderr.flush()
         logger.debug(f"Completed indexing {directory}: {len(hash_to_files)} unique file contents found")
 
-    return hash_to_files
+    return {digest.hex(): paths for digest, paths in hash_to_files.items()}
 
 
-def find_matching_files(dir1: str | Path, dir2: str | Path, hash_algorithm: str = 'md5', fast_mode: bool = False, verbose: bool = False, different_names_only: bool = False) -> tuple[dict[str, tuple[list[str], list[str]]], list[str], list[str]]:
-    """Find files with identical content across two directories. Returns (matches, unmatched1, unmatched2)."""
-    if not verbose:
-        logger.info(f"Indexing directory: {dir1}")
-    hash_to_files1 = index_directory(dir1, hash_algorithm, fast_mode, verbose)
+def _partition_by_size(
+    files: list[tuple[str, os.stat_result]], sizes: set[int]
+) -> tuple[list[tuple[str, os.stat_result]], list[str]]:
+    """Split scanned files in one pass into those with a size in sizes and the paths of the rest."""
+    candidates = []
+    others = []
+    for entry in files:
+        if entry[1].st_size in sizes:
+            candidates.append(entry)
+        else:
+            others.append(entry[0])
+    return candidates, others
+
+
+def _split_cached(
+    candidates1: list[tuple[str, os.stat_result]],
+    candidates2: list[tuple[str, os.stat_result]],
+    cache: HashCache
+) -> tuple[list[tuple[str, os.stat_result]], list[tuple[str, os.stat_result]], list[tuple[str, os.stat_result]], list[tuple[str, os.stat_result]]]:
+    """Set aside the candidates that need no head read. Returns (kept1, kept2, rest1, rest2).
+
+    Kept are files with a cached digest, and on both sides every uncached file of a size
+    that has a cached file on either side. A cached file's head is never read, so files
+    of its size cannot be ruled out by head, and keeping their same-size partners on
+    the same side as well means none is head-compared against an incomplete set.
+    """
+    splits = []
+    for candidates in (candidates1, candidates2):
+        hits = []
+        misses = []
+        for entry in candidates:
+            if cache.get(entry[1]) is None:
+                misses.append(entry)
+            else:
+                hits.append(entry)
+        splits.append((hits, misses))
+    (hits1, misses1), (hits2, misses2) = splits
+    cached_sizes = {file_stat.st_size for _, file_stat in chain(hits1, hits2)}
+
+    results = []
+    for hits, misses in ((hits1, misses1), (hits2, misses2)):
+        kept = hits
+        rest = []
+        for entry in misses:
+            if entry[1].st_size in cached_sizes:
+                kept.append(entry)
+            else:
+                rest.append(entry)
+        results.append((kept, rest))
+    (kept1, rest1), (kept2, rest2) = results
+    return kept1, kept2, rest1, rest2
 
+
+def _filter_by_head(
+    candidates1: list[tuple[str, os.stat_result]],
+    candidates2: list[tuple[str, os.stat_result]],
+    hash_algorithm: str,
+    verbose: bool,
+    workers: int
+) -> tuple[list[tuple[str, os.stat_result]], list[tuple[str, os.stat_result]], list[str], list[str]]:
+    """Drop files of HEAD_FILTER_MIN_SIZE or more whose leading bytes match no same-size file on the other side.
+
+    Returns (kept1, kept2, dropped1, dropped2). Smaller files are kept as they are: their
+    full hash costs little more than a head hash would. With workers > 1, head hashes run in a
+    thread pool: each is one short read, during which the GIL is released.
+    """
+    large1 = [entry for entry in candidates1 if entry[1].st_size >= HEAD_FILTER_MIN_SIZE]
+    large2 = [entry for entry in candidates2 if entry[1].st_size >= HEAD_FILTER_MIN_SIZE]
+    if not large1 or not large2:
+        return candidates1, candidates2, [], []
+
+    # Head digests have the file size mixed in, so they alone are the join key: bytes
+    # cache their hash, where (size, digest) tuples would be rehashed on every lookup
+    with contextlib.ExitStack() as stack:
+        readers = None
+        if workers > 1 and max(len(large1), len(large2)) >= PARALLEL_HASH_MIN_FILES:
+            readers = stack.enter_context(_start_read_pool(workers))
+        heads1 = list(hash_files(large1, hash_algorithm, False, verbose, workers, readers, head_only=True))
+        heads2 = list(hash_files(large2, hash_algorithm, False, verbose, workers, readers, head_only=True))
+    shared = {head for _, _, head in heads1} & {head for _, _, head in heads2}
+
+    results = []
+    for candidates, heads in ((candidates1, heads1), (candidates2, heads2)):
+        kept = [entry for entry in candidates if entry[1].st_size < HEAD_FILTER_MIN_SIZE]
+        dropped = []
+        for path, file_stat, head in heads:
+            if head in shared:
+                kept.append((path, file_stat))
+            else:
+                dropped.append(path)
+        results.append((kept, dropped))
+    (kept1, dropped1), (kept2, dropped2) = results
+    return kept1, kept2, dropped1, dropped2
+
+
+def find_matching_files(dir1: str | Path, dir2: str | Path, hash_algorithm: str = 'md5', fast_mode: bool = False, verbose: bool = False, different_names_only: bool = False, device_ids: dict[str, int] | None = None, workers: int = 1, file_sizes: dict[str, int] | None = None, mtimes: dict[str, float] | None = None, cache: HashCache | None = None, inodes: dict[str, int] | None = None) -> tuple[dict[str, tuple[list[str], list[str]]], list[str], list[str]]:
+    """Find files with identical content across two directories. Returns (matches, unmatched1, unmatched2).
+
+    device_ids, file_sizes, mtimes, cache and inodes, when given, are used as in index_directory.
+
+    Only files whose size also occurs in the other directory are hashed; any
+    other file cannot have a match and goes straight to the unmatched list.
+    Files from HEAD_FILTER_MIN_SIZE up are then compared by their first HEAD_HASH_SIZE
+    bytes, and only those matching a same-size file on the other side are hashed in full.
+    With a cache, files whose digest it holds are not head-compared (see _split_cached).
+    """
     if not verbose:
+        logger.info(f"Indexing directory: {dir1}")
         logger.info(f"Indexing directory: {dir2}")
-    hash_to_files2 = index_directory(dir2, hash_algorithm, fast_mode, verbose)
+    files1, files2 = _scan_both(dir1, dir2, workers)
 
-    common_hashes = set(hash_to_files1.keys()) & set(hash_to_files2.keys())
-    unique_hashes1 = set(hash_to_files1.keys()) - common_hashes
-    unique_hashes2 = set(hash_to_files2.keys()) - common_hashes
+    # A size seen on only one side cannot match, however many files share it there.
+    # intersection() streams the other side's sizes instead of building a second set.
+    if len(files1) > len(files2):
+        smaller, larger = files2, files1
+    else:
+        smaller, larger = files1, files2
+    shared_sizes = {file_stat.st_size for _, file_stat in smaller}.intersection(
+        file_stat.st_size for _, file_stat in larger
+    )
+
+    candidates1, unmatched1 = _partition_by_size(files1, shared_sizes)
+    candidates2, unmatched2 = _partition_by_size(files2, shared_sizes)
+
+    indexes = []
+    with contextlib.ExitStack() as stack:
+        # One worker pool serves both directories, so its startup is paid once
+        executor = None
+        if workers > 1 and max(len(candidates1), len(candidates2)) >= PARALLEL_HASH_MIN_FILES:
+            executor = stack.enter_context(_start_hash_pool(workers))
+
+        # Cached files skip the head prefilter: their full digest costs no read at all
+        kept1: list[tuple[str, os.stat_result]] = []
+        kept2: list[tuple[str, os.stat_result]] = []
+        if cache is not None:
+            kept1, kept2, candidates1, candidates2 = _split_cached(candidates1, candidates2, cache)
+
+        candidates1, candidates2, dropped1, dropped2 = _filter_by_head(
+            candidates1, candidates2, hash_algorithm, verbose, workers
+        )
+        candidates1 = kept1 + candidates1
+        candidates2 = kept2 + candidates2
+        unmatched1.extend(dropped1)
+        unmatched2.extend(dropped2)
 
+        for directory, files, candidates in ((dir1, files1, candidates1), (dir2, files2, candidates2)):
+            if verbose:
+                logger.debug(f"Found {len(candidates)} files to process in {directory} ({len(files) - len(candidates)} skipped, no possible match)")
+            hash_to_files = _index_files(
+                candidates, hash_algorithm, fast_mode, verbose, device_ids, workers, file_sizes, executor, mtimes, cache, inodes
+            )
+            if verbose:
+                logger.debug(f"Completed indexing {directory}: {len(hash_to_files)} unique file contents found")
+            indexes.append(hash_to_files)
+    hash_to_files1, hash_to_files2 = indexes
+
+    # One pass over dir1's index: a hash is matched if dir2 has it too. Popping matched
+    # hashes from dir2's index leaves exactly its unmatched files behind, so no
+    # common/unique hash sets need to be built alongside the two indexes.
     matches = {}
-    for file_hash in common_hashes:
-        files1 = hash_to_files1[file_hash]
-        files2 = hash_to_files2[file_hash]
+    for digest, files1 in hash_to_files1.items():
+        files2 = hash_to_files2.pop(digest, None)
+        if files2 is None:
+            unmatched1.extend(files1)
+            continue
 
         if different_names_only:
-            names1 = {os.path.basename(f) for f in files1}
-            names2 = {os.path.basename(f) for f in files2}
-            if names1 == names2 and len(names1) == 1:
-                continue
-
-        matches[file_hash] = (files1, files2)
+            # Skip only when every file on both sides has the same name. Once dir1 shows
+            # two names the bucket is kept without looking at dir2 at all. Paths are
+            # absolute, so str methods stand in for os.path.basename at a third the cost.
+            if len(files1) == 1:
+                # The common one-file-per-side pair needs no set at all
+                name = files1[0].rpartition(os.sep)[2]
+            else:
+                names1 = {f.rpartition(os.sep)[2] for f in files1}
+                name = names1.pop() if len(names1) == 1 else None
+            if name is not None:
+                # Separator-anchored, so 'xfile' does not pass for 'file'
+                suffix = os.sep + name
+                if all(f.endswith(suffix) for f in files2):
+                    continue
 
-    unmatched1 = []
-    for file_hash in unique_hashes1:
-        unmatched1.extend(hash_to_files1[file_hash])
+        matches[digest.hex()] = (files1, files2)
 
-    unmatched2 = []
-    for file_hash in unique_hashes2:
-        unmatched2.extend(hash_to_files2[file_hash])
+    unmatched2.extend(chain.from_iterable(hash_to_files2.values()))
 
     return matches, unmatched1, unmatched2
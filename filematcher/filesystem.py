@@ -17,19 +17,35 @@ def get_device_id(path: str) -> int:
     return os.stat(path).st_dev
 
 
-def check_cross_filesystem(master_file: str, duplicates: list[str]) -> set[str]:
-    """Return set of duplicates on different filesystems than master."""
+def check_cross_filesystem(
+    master_file: str,
+    duplicates: list[str],
+    device_ids: dict[str, int] | None = None
+) -> set[str]:
+    """Return set of duplicates on different filesystems than master.
+
+    Device IDs recorded during the directory scan (device_ids) are used
+    where known; only the other files need a stat.
+    """
     if not duplicates:
         return set()
 
+    if device_ids is None:
+        device_ids = {}
+
     try:
-        master_device = get_device_id(master_file)
+        master_device = device_ids[master_file] if master_file in device_ids else get_device_id(master_file)
     except OSError as e:
         logger.debug(f"Could not get device ID for master {master_file}: {e}")
         return set(duplicates)
 
     cross_fs = set()
     for dup in duplicates:
+        known_device = device_ids.get(dup)
+        if known_device is not None:
+            if known_device != master_device:
+                cross_fs.add(dup)
+            continue
         try:
             if get_device_id(dup) != master_device:
                 cross_fs.add(dup)
@@ -66,14 +82,41 @@ def is_symlink_to(duplicate: str, master: str) -> bool:
 
 
 def filter_hardlinked_duplicates(
-    master_file: str, duplicates: list[str]
+    master_file: str,
+    duplicates: list[str],
+    device_ids: dict[str, int] | None = None,
+    inodes: dict[str, int] | None = None
 ) -> tuple[list[str], list[str]]:
-    """Separate duplicates into (actionable, already_hardlinked)."""
+    """Separate duplicates into (actionable, already_hardlinked).
+
+    Device IDs and inode numbers recorded during the directory scan are used where
+    both are known; other files get one lstat each, the master included, rather
+    than one lstat of each side per pair.
+    """
+    if not duplicates:
+        return [], []
+
+    def file_id(path: str) -> tuple[int, int]:
+        if device_ids and inodes and path in inodes and path in device_ids:
+            return device_ids[path], inodes[path]
+        file_stat = os.lstat(path)
+        return file_stat.st_dev, file_stat.st_ino
+
+    try:
+        master_id = file_id(master_file)
+    except OSError as e:
+        logger.debug(f"Could not stat master for hardlink check ({master_file}): {e}")
+        return list(duplicates), []
+
     actionable = []
     hardlinked = []
-
     for dup in duplicates:
-        if is_hardlink_to(master_file, dup):
+        try:
+            linked = file_id(dup) == master_id
+        except OSError as e:
+            logger.debug(f"Could not stat files for hardlink check ({master_file}, {dup}): {e}")
+            linked = False
+        if linked:
             hardlinked.append(dup)
         else:
             actionable.append(dup)
@@ -82,9 +125,12 @@ def filter_hardlinked_duplicates(
 
 
 def is_in_directory(filepath: str, directory: str) -> bool:
-    """Check if a file path is within a directory."""
-    try:
-        Path(filepath).relative_to(directory)
-        return True
-    except ValueError:
-        return False
+    """Check if a file path is within a directory.
+
+    Both paths are normalized first, then compared with a string prefix test on the
+    separator-terminated directory, so /a/bc is not inside /a/b.
+    """
+    filepath = os.path.normpath(filepath)
+    directory = os.path.normpath(directory)
+    prefix = directory if directory.endswith(os.sep) else directory + os.sep
+    return filepath == directory or filepath.startswith(prefix)
@@ -9,12 +9,13 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from datetime import datetime, timezone
-import json
+import heapq
+from itertools import chain
 import logging
 import os
 from pathlib import Path
 import shutil
+import sys
 
 logger = logging.getLogger(__name__)
 
@@ -61,8 +62,34 @@ class SpaceInfo:
     bytes_saved: int
     duplicate_count: int
     group_count: int
+    cross_fs_count: int = 0
 
 
+@dataclass
+class CompareStats:
+    """Match and unmatched file counts for compare mode, computed once per run."""
+    match_count: int
+    matched_files1: int
+    matched_files2: int
+    unmatched_count1: int
+    unmatched_count2: int
+
+
+def _write_lines(lines: list[str]) -> None:
+    """Write lines to stdout with a single write call (one print() per line is much slower)."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _write_json(data: dict) -> None:
+    """Serialize data as indented JSON and emit it to stdout in a single write."""
+    # Deferred, with datetime below: text-mode runs never need either module
+    import json
+
+    sys.stdout.write(json.dumps(data, indent=2) + "\n")
+
+
+DEFAULT_MAX_ERRORS_SHOWN = 100
+
 PREVIEW_BANNER = "=== PREVIEW MODE - Use --execute to apply changes ==="
 BANNER_SEPARATOR = "-" * 40
 
@@ -122,9 +149,13 @@ class ActionFormatter(ABC):
         group_index: int | None = None,
         total_groups: int | None = None,
         target_dir: str | None = None,
-        dir2_base: str | None = None
+        dir2_base: str | None = None,
+        presorted: bool = False
     ) -> None:
-        """Output a duplicate group showing master and duplicates."""
+        """Output a duplicate group showing master and duplicates.
+
+        presorted=True promises duplicates are already in sorted order, skipping a re-sort.
+        """
         ...
 
     @abstractmethod
@@ -310,6 +341,8 @@ class JsonActionFormatter(ActionFormatter):
         Returns:
             Header dictionary with name, version, timestamp, mode, hashAlgorithm, directories
         """
+        from datetime import datetime, timezone
+
         header: dict = {
             "name": "filematcher",
             "version": "2.0",
@@ -349,10 +382,11 @@ class JsonActionFormatter(ActionFormatter):
         group_index: int | None = None,
         total_groups: int | None = None,
         target_dir: str | None = None,
-        dir2_base: str | None = None
+        dir2_base: str | None = None,
+        presorted: bool = False
     ) -> None:
         self._action_type = action
-        sorted_duplicates = sorted(duplicates)
+        sorted_duplicates = duplicates if presorted else sorted(duplicates)
         dup_objects = []
         for dup in sorted_duplicates:
             dup_obj: dict = {
@@ -383,6 +417,8 @@ class JsonActionFormatter(ActionFormatter):
         self._data["duplicateGroups"].append(group)
 
         if self.verbose:
+            from datetime import datetime, timezone
+
             all_files = [master_file] + sorted_duplicates
             for f in all_files:
                 try:
@@ -471,15 +507,20 @@ class JsonActionFormatter(ActionFormatter):
         dir2_label: str,
         unmatched2: list[str]
     ) -> None:
-        self._data["unmatchedMaster"] = sorted(unmatched1)
-        self._data["unmatchedDuplicate"] = sorted(unmatched2)
+        # Sorted in place: the lists are this run's own, and a sorted() copy doubles peak memory
+        unmatched1.sort()
+        unmatched2.sort()
+        self._data["unmatchedMaster"] = unmatched1
+        self._data["unmatchedDuplicate"] = unmatched2
         if "summary" not in self._data:
             self._data["summary"] = {}
         self._data["summary"]["unmatchedFilesMaster"] = len(unmatched1)
         self._data["summary"]["unmatchedFilesDuplicate"] = len(unmatched2)
 
         if self.verbose:
-            for f in unmatched1 + unmatched2:
+            from datetime import datetime, timezone
+
+            for f in chain(unmatched1, unmatched2):
                 try:
                     stat = os.stat(f)
                     self._metadata[f] = {
@@ -588,7 +629,7 @@ class JsonActionFormatter(ActionFormatter):
                 "spaceReclaimableFormatted": None
             }
 
-            print(json.dumps(compare_data, indent=2))
+            _write_json(compare_data)
             return
 
         # Action modes: build header and sort for determinism
@@ -619,7 +660,7 @@ class JsonActionFormatter(ActionFormatter):
         if "quit" in self._data:
             output_data["quit"] = self._data["quit"]
 
-        print(json.dumps(output_data, indent=2))
+        _write_json(output_data)
 
 
 class TextActionFormatter(ActionFormatter):
@@ -631,10 +672,13 @@ class TextActionFormatter(ActionFormatter):
         preview_mode: bool = True,
         action: str | None = None,
         color_config: ColorConfig | None = None,
-        will_execute: bool = False
+        will_execute: bool = False,
+        max_errors_shown: int = DEFAULT_MAX_ERRORS_SHOWN
     ):
         super().__init__(verbose, preview_mode, action, will_execute)
         self.cc = color_config or ColorConfig(mode=ColorMode.NEVER)
+        # Cap on failed files listed in the execution summary (0 = no cap); the audit log has them all
+        self.max_errors_shown = max_errors_shown
         # Track terminal rows for cursor movement in interactive mode
         self._last_duplicate_rows: int = 0
 
@@ -646,7 +690,6 @@ class TextActionFormatter(ActionFormatter):
         space_bytes: int
     ) -> None:
         """Output unified banner with statistics and mode indicator."""
-        print()  # Separator from scanning phase output
         action_bold = bold(action, self.cc)
         space_str = format_file_size(space_bytes)
 
@@ -654,8 +697,8 @@ class TextActionFormatter(ActionFormatter):
             # Compare mode: informational, no action taken
             banner = f"{action_bold} mode: {group_count} groups, {duplicate_count} files, {space_str} reclaimable"
             mode_indicator = cyan(" (COMPARE)", self.cc)
-            print(banner + mode_indicator)
-            print(BANNER_SEPARATOR)
+            # Leading blank line separates the banner from scanning phase output
+            _write_lines(["", banner + mode_indicator, BANNER_SEPARATOR])
             return
 
         # Action modes (hardlink/symlink/delete)
@@ -667,19 +710,16 @@ class TextActionFormatter(ActionFormatter):
         else:
             mode_indicator = yellow(" (PREVIEW)", self.cc)
 
-        print(banner + mode_indicator)
-        print(BANNER_SEPARATOR)
+        lines = ["", banner + mode_indicator, BANNER_SEPARATOR]
 
         # Show preview hint if in preview mode
         if not self.will_execute and self.preview_mode:
-            print(dim("Use --execute to apply changes", self.cc))
-            print()
+            lines.extend([dim("Use --execute to apply changes", self.cc), ""])
+        _write_lines(lines)
 
     def format_warnings(self, warnings: list[str]) -> None:
-        for warning in warnings:
-            print(red(warning, self.cc))
         if warnings:
-            print()
+            _write_lines([red(warning, self.cc) for warning in warnings] + [""])
 
     def format_duplicate_group(
         self,
@@ -692,7 +732,8 @@ class TextActionFormatter(ActionFormatter):
         group_index: int | None = None,
         total_groups: int | None = None,
         target_dir: str | None = None,
-        dir2_base: str | None = None
+        dir2_base: str | None = None,
+        presorted: bool = False
     ) -> None:
         lines: list[GroupLine] = format_duplicate_group(
             master_file=master_file,
@@ -704,7 +745,8 @@ class TextActionFormatter(ActionFormatter):
             preview_mode=self.preview_mode,
             will_execute=self.will_execute,
             target_dir=target_dir,
-            dir2_base=dir2_base
+            dir2_base=dir2_base,
+            presorted=presorted
         )
 
         if self.verbose and file_hash:
@@ -717,12 +759,14 @@ class TextActionFormatter(ActionFormatter):
         # Track terminal rows for non-master lines (for cursor movement)
         term_width = shutil.get_terminal_size().columns
         self._last_duplicate_rows = 0
+        rendered_lines: list[str] = []
         for line in lines:
             rendered = render_group_line(line, self.cc)
-            print(rendered)
+            rendered_lines.append(rendered)
             # Count rows for non-master lines (duplicates and hash)
             if line.line_type != "master":
                 self._last_duplicate_rows += terminal_rows_for_line(rendered, term_width)
+        _write_lines(rendered_lines)
 
     def format_statistics(
         self,
@@ -744,11 +788,7 @@ class TextActionFormatter(ActionFormatter):
             preview_mode=self.preview_mode,
             will_execute=self.will_execute
         )
-        for line in lines:
-            if line == "--- Statistics ---":
-                print(cyan(line, self.cc))
-            else:
-                print(line)
+        _write_lines([cyan(line, self.cc) if line == "--- Statistics ---" else line for line in lines])
 
     def format_execution_summary(
         self,
@@ -761,22 +801,28 @@ class TextActionFormatter(ActionFormatter):
         confirmed_count: int = 0,
         user_skipped_count: int = 0
     ) -> None:
-        print()
-        print("Execution complete:")
-        print(f"  User confirmed: {confirmed_count}")
-        print(f"  User skipped: {user_skipped_count}")
-        print(f"  Succeeded: {success_count}")
-        print(f"  Failed: {failure_count}")
+        lines = [
+            "",
+            "Execution complete:",
+            f"  User confirmed: {confirmed_count}",
+            f"  User skipped: {user_skipped_count}",
+            f"  Succeeded: {success_count}",
+            f"  Failed: {failure_count}",
+        ]
         if skipped_count > 0:
-            print(f"  Already linked: {skipped_count}")
-        print(f"  Space freed: {format_file_size(space_saved)} ({space_saved:,} bytes)")
-        print(f"  Audit log: {log_path}")
+            lines.append(f"  Already linked: {skipped_count}")
+        lines.append(f"  Space freed: {format_file_size(space_saved)} ({space_saved:,} bytes)")
+        lines.append(f"  Audit log: {log_path}")
         if failed_list:
-            print()
-            print("Failed files:")
+            lines.extend(["", "Failed files:"])
             x_mark = red("\u2717", self.cc)
-            for path, error in sorted(failed_list):
-                print(f"  {x_mark} {path}: {error}")
+            truncated = 0 < self.max_errors_shown < len(failed_list)
+            # nsmallest keeps only the first N in sorted order instead of sorting every failure
+            shown = heapq.nsmallest(self.max_errors_shown, failed_list) if truncated else sorted(failed_list)
+            lines.extend(f"  {x_mark} {path}: {error}" for path, error in shown)
+            if truncated:
+                lines.append(f"  ... ({len(failed_list) - self.max_errors_shown} more, see audit log)")
+        _write_lines(lines)
 
     def format_empty_result(self) -> None:
         print("No matching files found." if self._action == "compare" else "No duplicates found.")
@@ -789,10 +835,13 @@ class TextActionFormatter(ActionFormatter):
         dir1_name: str,
         dir2_name: str
     ) -> None:
-        print("\nMatched files summary:")
-        print(f"  Unique content hashes with matches: {match_count}")
-        print(f"  Files in {dir1_name} with matches in {dir2_name}: {matched_files1}")
-        print(f"  Files in {dir2_name} with matches in {dir1_name}: {matched_files2}")
+        _write_lines([
+            "",
+            "Matched files summary:",
+            f"  Unique content hashes with matches: {match_count}",
+            f"  Files in {dir1_name} with matches in {dir2_name}: {matched_files1}",
+            f"  Files in {dir2_name} with matches in {dir1_name}: {matched_files2}",
+        ])
 
     def format_unmatched_section(
         self,
@@ -801,16 +850,18 @@ class TextActionFormatter(ActionFormatter):
         dir2_label: str,
         unmatched2: list[str]
     ) -> None:
-        print("\nFiles with no content matches:")
-        print("==============================")
+        lines = ["\nFiles with no content matches:", "=============================="]
+        # Sorted in place and joined straight into one string, rather than a sorted copy
+        # plus one indented string per path
         if unmatched1:
-            print(f"\nUnique files in {dir1_label}:")
-            for f in sorted(unmatched1):
-                print(f"  {f}")
+            unmatched1.sort()
+            lines.append(f"\nUnique files in {dir1_label}:")
+            lines.append("  " + "\n  ".join(unmatched1))
         if unmatched2:
-            print(f"\nUnique files in {dir2_label}:")
-            for f in sorted(unmatched2):
-                print(f"  {f}")
+            unmatched2.sort()
+            lines.append(f"\nUnique files in {dir2_label}:")
+            lines.append("  " + "\n  ".join(unmatched2))
+        _write_lines(lines)
 
     def format_user_abort(self) -> None:
         print("Aborted. No changes made.")
@@ -905,9 +956,13 @@ def format_group_lines(
     verbose: bool = False,
     file_sizes: dict[str, int] | None = None,
     dup_count: int | None = None,
-    cross_fs_files: set[str] | None = None
+    cross_fs_files: set[str] | None = None,
+    presorted: bool = False
 ) -> list[GroupLine]:
-    """Format group lines returning structured GroupLine objects."""
+    """Format group lines returning structured GroupLine objects.
+
+    Secondary files are sorted by path unless presorted is True.
+    """
     lines: list[GroupLine] = []
 
     if verbose and file_sizes:
@@ -920,9 +975,17 @@ def format_group_lines(
 
     lines.append(GroupLine(line_type="master", label=f"{primary_label}: ", path=path_with_info))
 
-    for path, label in sorted(secondary_files, key=lambda x: x[0]):
+    if not presorted:
+        secondary_files = sorted(secondary_files, key=lambda x: x[0])
+
+    # Duplicates in a group nearly always share one label, so build each "LABEL: " prefix once
+    label_prefixes: dict[str, str] = {}
+    for path, label in secondary_files:
+        prefix = label_prefixes.get(label)
+        if prefix is None:
+            prefix = label_prefixes[label] = f"{label}: "
         warning = " [!cross-fs]" if cross_fs_files and path in cross_fs_files else ""
-        lines.append(GroupLine(line_type="duplicate", label=f"{label}: ", path=path, warning=warning, indent="    "))
+        lines.append(GroupLine(line_type="duplicate", label=prefix, path=path, warning=warning, indent="    "))
 
     return lines
 
@@ -942,7 +1005,8 @@ def format_duplicate_group(
     preview_mode: bool = True,
     will_execute: bool = False,
     target_dir: str | None = None,
-    dir2_base: str | None = None
+    dir2_base: str | None = None,
+    presorted: bool = False
 ) -> list[GroupLine]:
     """Format a duplicate group returning structured GroupLine objects."""
     if action == "compare":
@@ -963,6 +1027,8 @@ def format_duplicate_group(
             target_path = compute_target_path(dup, target_dir, dir2_base)
             display_path = target_path if target_path else dup
             secondary_files.append((display_path, action_label))
+        # Display paths differ from the input order, so they must be sorted again
+        presorted = False
     else:
         secondary_files = [(dup, action_label) for dup in duplicates]
 
@@ -973,7 +1039,8 @@ def format_duplicate_group(
         verbose=verbose,
         file_sizes=file_sizes,
         dup_count=len(duplicates),
-        cross_fs_files=cross_fs_files
+        cross_fs_files=cross_fs_files,
+        presorted=presorted
     )
 
 
@@ -996,19 +1063,20 @@ def format_statistics_footer(
     will_execute: bool = False
 ) -> list[str]:
     """Format the statistics footer for preview/execute output."""
-    lines = ["", "--- Statistics ---"]
-    lines.append(f"Total files with matches: {master_count + duplicate_count}")
-    lines.append(f"Duplicate groups: {group_count}")
+    lines = [
+        "",
+        "--- Statistics ---",
+        f"Total files with matches: {master_count + duplicate_count}",
+        f"Duplicate groups: {group_count}",
+    ]
 
     if action != 'compare':
-        lines.append(f"Master files preserved: {master_count}")
-        lines.append(f"Duplicate files: {duplicate_count}")
+        lines += [f"Master files preserved: {master_count}", f"Duplicate files: {duplicate_count}"]
 
     space_str = format_file_size(space_savings)
     if verbose:
-        lines.append(f"Space to be reclaimed: {space_str}  ({space_savings:,} bytes)")
-    else:
-        lines.append(f"Space to be reclaimed: {space_str}")
+        space_str = f"{space_str}  ({space_savings:,} bytes)"
+    lines.append(f"Space to be reclaimed: {space_str}")
 
     if action == Action.COMPARE:
         lines.extend(["", "Use --action to deduplicate (hardlink, symlink, or delete)"])
@@ -1019,21 +1087,48 @@ def format_statistics_footer(
 
 
 def calculate_space_savings(
-    duplicate_groups: list[DuplicateGroup]
+    duplicate_groups: list[DuplicateGroup],
+    cross_fs_files: set[str] | None = None,
+    file_sizes: dict[str, int] | None = None
 ) -> SpaceInfo:
-    """Calculate space that would be saved by deduplication."""
+    """Calculate space that would be saved by deduplication.
+
+    Cross-filesystem duplicates are counted in the same pass when cross_fs_files is given.
+    Master sizes are taken from file_sizes when present, avoiding a stat per group.
+    """
     if not duplicate_groups:
         return SpaceInfo(0, 0, 0)
 
     total_bytes = 0
     total_duplicates = 0
     groups_with_duplicates = 0
+    cross_fs_count = 0
+    sizes = file_sizes or {}
 
     for master_file, duplicates, _reason, _hash in duplicate_groups:
         if duplicates:
-            file_size = os.path.getsize(master_file)
+            file_size = sizes.get(master_file)
+            if file_size is None:
+                file_size = os.path.getsize(master_file)
             total_bytes += file_size * len(duplicates)
             total_duplicates += len(duplicates)
             groups_with_duplicates += 1
-
-    return SpaceInfo(total_bytes, total_duplicates, groups_with_duplicates)
+            if cross_fs_files:
+                # Set intersection counts in C rather than a generator step per duplicate
+                cross_fs_count += len(cross_fs_files.intersection(duplicates))
+
+    return SpaceInfo(total_bytes, total_duplicates, groups_with_duplicates, cross_fs_count)
+
+
+def calculate_compare_stats(
+    matches: dict[str, tuple[list[str], list[str]]],
+    unmatched1: list[str],
+    unmatched2: list[str]
+) -> CompareStats:
+    """Count matched files per directory in a single pass over matches."""
+    matched_files1 = 0
+    matched_files2 = 0
+    for files1, files2 in matches.values():
+        matched_files1 += len(files1)
+        matched_files2 += len(files2)
+    return CompareStats(len(matches), matched_files1, matched_files2, len(unmatched1), len(unmatched2))
@@ -6,41 +6,214 @@ Provides content hashing with optional fast mode using sparse sampling for large
 from __future__ import annotations
 
 import hashlib
+import mmap
 import os
+from functools import lru_cache
 from pathlib import Path
 
 # Size constants
 LARGE_FILE_THRESHOLD = 100 * 1024 * 1024  # 100 MB - files larger than this use sparse hashing in fast mode
 SPARSE_SAMPLE_SIZE = 1024 * 1024  # 1 MB - size of each sample point in sparse hashing
-READ_CHUNK_SIZE = 4096  # 4 KB - chunk size for reading files during full hashing
+SPARSE_SAMPLE_POINTS = 5  # start, 1/4, middle, 3/4, end - evenly spaced sample points
+READ_CHUNK_SIZE = 1024 * 1024  # 1 MB - read size for full hashing when hashlib.file_digest is unavailable
+MMAP_MIN_SIZE = 1024 * 1024  # 1 MB - below this, one read() is as fast as mapping and faulting pages in
+MMAP_MAX_SIZE = 256 * 1024 * 1024  # 256 MB - larger files are mapped in windows
+MMAP_WINDOW_SIZE = 32 * 1024 * 1024  # 32 MB - window size for mapping very large files
+HEAD_HASH_SIZE = 64 * 1024  # 64 KB - leading bytes compared before a same-size file is fully hashed
+BLAKE2B_DIGEST_SIZE = 16  # bytes - 128-bit BLAKE2b digest, ample for duplicate detection
+
+CPUINFO_PATH = "/proc/cpuinfo"
+
+
+@lru_cache(maxsize=None)
+def _load_blake3():
+    """Return the optional third-party blake3 module, or None if it is not installed."""
+    try:
+        import blake3
+    except ImportError:
+        return None
+    return blake3
 
 
 def create_hasher(hash_algorithm: str = 'md5') -> hashlib._Hash:
-    """Create a hash object for the specified algorithm ('md5' or 'sha256')."""
+    """Create a hash object for the specified algorithm ('md5', 'sha256', 'blake2b' or 'blake3')."""
     if hash_algorithm == 'md5':
         return hashlib.md5()
     elif hash_algorithm == 'sha256':
         return hashlib.sha256()
+    elif hash_algorithm == 'blake2b':
+        # 128-bit digest keeps hashes the same width as MD5 in output and audit logs
+        return hashlib.blake2b(digest_size=BLAKE2B_DIGEST_SIZE)
+    elif hash_algorithm == 'blake3':
+        blake3 = _load_blake3()
+        if blake3 is None:
+            raise ValueError("blake3 hashing requires the 'blake3' package (pip install blake3)")
+        # Single-threaded: files are already spread over worker processes
+        return blake3.blake3()
     else:
         raise ValueError(f"Unsupported hash algorithm: {hash_algorithm}")
 
 
-def get_file_hash(filepath: str | Path, hash_algorithm: str = 'md5', fast_mode: bool = False, size_threshold: int = LARGE_FILE_THRESHOLD) -> str:
-    """Calculate hash of file content, using sparse sampling for large files in fast mode."""
-    file_size = os.path.getsize(filepath)
+@lru_cache(maxsize=None)
+def cpu_has_sha_extensions() -> bool | None:
+    """Whether the CPU has SHA-256 instructions (x86 SHA-NI, ARMv8 SHA2); None if unknown.
 
-    if not fast_mode or file_size < size_threshold:
+    OpenSSL, and with it hashlib.sha256, uses them when present; without them SHA-256
+    runs several times slower than BLAKE2b.
+    """
+    try:
+        with open(CPUINFO_PATH, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key.strip() in ("flags", "Features"):
+                    flags = value.split()
+                    return "sha_ni" in flags or "sha2" in flags
+    except OSError:
+        pass
+    return None
+
+
+def resolve_hash_algorithm(hash_algorithm: str) -> str:
+    """Map 'auto' to the fastest available hash on this CPU; other names pass through.
+
+    BLAKE3, when its optional package is installed, beats everything else through SIMD.
+    Otherwise SHA-256 with hardware SHA instructions outruns BLAKE2b, which in turn
+    beats SHA-256 and MD5 in software.
+    """
+    if hash_algorithm == 'auto':
+        if _load_blake3() is not None:
+            return 'blake3'
+        return 'sha256' if cpu_has_sha_extensions() else 'blake2b'
+    return hash_algorithm
+
+
+def get_mapped_hash(filepath: str | Path, hash_algorithm: str = 'md5', file_size: int | None = None) -> str:
+    """Hash file content through read-only memory maps, avoiding a bytes copy per chunk."""
+    return _mapped_hasher(filepath, hash_algorithm, file_size).hexdigest()
+
+
+def _mapped_hasher(filepath: str | Path, hash_algorithm: str, file_size: int | None) -> hashlib._Hash:
+    h = create_hasher(hash_algorithm)
+
+    with open(filepath, 'rb') as f:
+        if file_size is None:
+            file_size = os.fstat(f.fileno()).st_size
+        window = file_size if file_size <= MMAP_MAX_SIZE else MMAP_WINDOW_SIZE
+        for offset in range(0, file_size, window):
+            length = min(window, file_size - offset)
+            with mmap.mmap(f.fileno(), length, offset=offset, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, 'madvise'):
+                    # Hashed front to back once: aggressive readahead, pages can go right after
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                h.update(mm)
+
+    return h
+
+
+def _update_from_file(h: hashlib._Hash, f) -> None:
+    """Feed the rest of binary file f into h, in C via hashlib.file_digest where available (3.11+)."""
+    file_digest = getattr(hashlib, 'file_digest', None)
+    if file_digest is not None:
+        # file_digest updates whatever object the factory returns, so h keeps any prefix it has
+        file_digest(f, lambda: h)
+        return
+    # One reusable buffer instead of a fresh bytes object per chunk
+    buf = bytearray(READ_CHUNK_SIZE)
+    view = memoryview(buf)
+    while True:
+        size = f.readinto(buf)
+        if not size:
+            break
+        h.update(view[:size])
+
+
+def _read_hasher(filepath: str | Path, hash_algorithm: str) -> hashlib._Hash:
+    """Hash file content with buffered reads."""
+    h = create_hasher(hash_algorithm)
+    with open(filepath, 'rb', buffering=0) as f:
+        if hasattr(os, 'posix_fadvise'):
+            # Used when mmap is unavailable: still ask for sequential readahead
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        _update_from_file(h, f)
+    return h
+
+
+def _small_hasher(filepath: str | Path, hash_algorithm: str) -> hashlib._Hash:
+    """Hash a small file from one read(); file_digest would zero a 256 KB buffer for it."""
+    with open(filepath, 'rb', buffering=0) as f:
         h = create_hasher(hash_algorithm)
-        with open(filepath, 'rb') as f:
-            for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
-                h.update(chunk)
-        return h.hexdigest()
+        h.update(f.read())
+        return h
+
+
+def get_file_hash(filepath: str | Path, hash_algorithm: str = 'md5', fast_mode: bool = False, size_threshold: int = LARGE_FILE_THRESHOLD, *, file_size: int | None = None, raw: bool = False) -> str | bytes:
+    """Calculate hash of file content, using sparse sampling for large files in fast mode.
+
+    Pass file_size when the caller already has it from a stat to skip another one.
+    With raw=True the digest is returned as bytes, half the size of the hex string.
+    """
+    if file_size is None:
+        file_size = os.path.getsize(filepath)
+
+    if not fast_mode or file_size < size_threshold:
+        if file_size < MMAP_MIN_SIZE:
+            h = _small_hasher(filepath, hash_algorithm)
+        else:
+            try:
+                h = _mapped_hasher(filepath, hash_algorithm, file_size)
+            except (OSError, ValueError):
+                # Filesystem does not support mmap (or file changed size) - fall back to read()
+                h = _read_hasher(filepath, hash_algorithm)
     else:
-        return get_sparse_hash(filepath, hash_algorithm, file_size)
+        h = _sparse_hasher(filepath, hash_algorithm, file_size, SPARSE_SAMPLE_SIZE)
+    return h.digest() if raw else h.hexdigest()
+
+
+def _sparse_offsets(file_size: int, sample_size: int) -> list[int]:
+    """Ascending sample offsets: each sample is centred on its point and clamped into the file."""
+    last = file_size - sample_size
+    quarters = SPARSE_SAMPLE_POINTS - 1
+    return [
+        min(max(0, file_size * i // quarters - sample_size // 2), last)
+        for i in range(SPARSE_SAMPLE_POINTS)
+    ]
+
+
+def _sample_spans(offsets: list[int], sample_size: int) -> list[tuple[int, int]]:
+    """Merge the (sorted) sample windows into (start, end) spans, so overlapping samples are read once."""
+    spans = []
+    for offset in offsets:
+        end = offset + sample_size
+        if spans and offset <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], end))
+        else:
+            spans.append((offset, end))
+    return spans
+
+
+def get_head_hash(filepath: str | Path, hash_algorithm: str = 'md5', head_size: int = HEAD_HASH_SIZE, *, file_size: int | None = None, raw: bool = False) -> str | bytes:
+    """Hash only the first head_size bytes of a file; cheaply tells most same-size files apart.
+
+    If file_size is given it is hashed first, as in get_sparse_hash, so equal digests
+    also mean equal sizes.
+    """
+    h = create_hasher(hash_algorithm)
+    if file_size is not None:
+        h.update(str(file_size).encode('utf-8'))
+    with open(filepath, 'rb', buffering=0) as f:
+        h.update(f.read(head_size))
+    return h.digest() if raw else h.hexdigest()
 
 
 def get_sparse_hash(filepath: str | Path, hash_algorithm: str = 'md5', file_size: int | None = None, sample_size: int = SPARSE_SAMPLE_SIZE) -> str:
     """Create hash from sparse sampling (start, 1/4, middle, 3/4, end) of a large file."""
+    return _sparse_hasher(filepath, hash_algorithm, file_size, sample_size).hexdigest()
+
+
+def _sparse_hasher(filepath: str | Path, hash_algorithm: str, file_size: int | None, sample_size: int) -> hashlib._Hash:
     h = create_hasher(hash_algorithm)
 
     if file_size is None:
@@ -49,24 +222,36 @@ def get_sparse_hash(filepath: str | Path, hash_algorithm: str = 'md5', file_size
     h.update(str(file_size).encode('utf-8'))
 
     if file_size <= 3 * sample_size:
-        with open(filepath, 'rb') as f:
-            h.update(f.read())
-        return h.hexdigest()
+        with open(filepath, 'rb', buffering=0) as f:
+            _update_from_file(h, f)
+        return h
 
-    with open(filepath, 'rb') as f:
-        # Sequential seek order for I/O optimization: start → 1/4 → middle → 3/4 → end
-        h.update(f.read(sample_size))
-
-        f.seek(file_size // 4 - sample_size // 2)
-        h.update(f.read(sample_size))
-
-        f.seek(file_size // 2 - sample_size // 2)
-        h.update(f.read(sample_size))
+    offsets = _sparse_offsets(file_size, sample_size)
+    spans = _sample_spans(offsets, sample_size)
 
-        f.seek((file_size * 3) // 4 - sample_size // 2)
-        h.update(f.read(sample_size))
-
-        f.seek(max(0, file_size - sample_size))
-        h.update(f.read(sample_size))
+    with open(filepath, 'rb') as f:
+        fd = f.fileno()
+        if hasattr(os, 'posix_fadvise'):
+            # Queue readahead for every span up front so the kernel can overlap
+            # the seeks instead of waiting on each one in turn
+            try:
+                for start, end in spans:
+                    os.posix_fadvise(fd, start, end - start, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass
+        if len(spans) == len(offsets) and hasattr(os, 'pread'):
+            for offset in offsets:
+                h.update(os.pread(fd, sample_size, offset))
+            return h
+        # Samples overlap (or pread is missing): read each span once and hash every
+        # sample from it in order, so the digest matches sampling one by one
+        samples = iter(offsets)
+        offset = next(samples)
+        for start, end in spans:
+            f.seek(start)
+            view = memoryview(f.read(end - start))
+            while offset is not None and offset < end:
+                h.update(view[offset - start:offset - start + sample_size])
+                offset = next(samples, None)
 
-    return h.hexdigest()
+    return h
@@ -9,7 +9,7 @@ from contextlib import redirect_stdout, redirect_stderr
 from pathlib import Path
 from unittest.mock import patch
 
-from filematcher import main, execute_action, is_hardlink_to
+from filematcher import main, execute_action, is_hardlink_to, build_log_flags
 from tests.test_base import BaseFileMatcherTest
 
 
@@ -65,6 +65,40 @@ class TestCLI(BaseFileMatcherTest):
             self.assertIn("Matched files summary:", output)
             self.assertNotIn("Unmatched files summary:", output)
 
+    def test_summary_space_uses_scanned_sizes(self):
+        """The space figure in summary and plain preview output is built from the scan, with no stat per group."""
+        for extra in (['--summary'], []):
+            with patch('sys.argv', ['file_matcher.py', self.test_dir1, self.test_dir2, '--action', 'hardlink', *extra]), \
+                    patch('filematcher.formatters.os.path.getsize') as mock_getsize:
+                self.run_main_capture_all([])
+            mock_getsize.assert_not_called()
+
+    def test_detailed_groups_flush_once_on_line_buffered_stdout(self):
+        """Groups written to a line-buffered (terminal) stdout are flushed together, and line buffering is restored."""
+        class CountingRaw(io.RawIOBase):
+            def __init__(self):
+                self.writes = 0
+
+            def writable(self):
+                return True
+
+            def write(self, b):
+                self.writes += 1
+                return len(b)
+
+        raw = CountingRaw()
+        stdout = io.TextIOWrapper(io.BufferedWriter(raw, buffer_size=1 << 20), line_buffering=True)
+        for i in range(20):
+            with open(os.path.join(self.test_dir1, f"extra{i}.txt"), "w") as f:
+                f.write(f"extra content {i}\n")
+            with open(os.path.join(self.test_dir2, f"copy{i}.txt"), "w") as f:
+                f.write(f"extra content {i}\n")
+        with patch('sys.argv', ['file_matcher.py', self.test_dir1, self.test_dir2]), \
+                redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+            main()
+        self.assertTrue(stdout.line_buffering)
+        self.assertLess(raw.writes, 10)
+
     def test_detailed_output_mode(self):
         """Test detailed output format (default mode) with hierarchical structure."""
         with patch('sys.argv', ['file_matcher.py', self.test_dir1, self.test_dir2]):
@@ -85,9 +119,17 @@ class TestCLI(BaseFileMatcherTest):
 
     def test_hash_algorithm_option(self):
         """Test the hash algorithm command-line option."""
-        # Test with MD5 (default)
+        # Default (auto): BLAKE2b without SHA instructions, SHA-256 with them
         # Logger messages go to stderr (Unix convention: status to stderr, data to stdout)
-        with patch('sys.argv', ['file_matcher.py', self.test_dir1, self.test_dir2]):
+        for sha_extensions, expected in ((False, "BLAKE2B"), (True, "SHA256")):
+            with patch('sys.argv', ['file_matcher.py', self.test_dir1, self.test_dir2]), \
+                    patch('filematcher.hashing._load_blake3', return_value=None), \
+                    patch('filematcher.hashing.cpu_has_sha_extensions', return_value=sha_extensions):
+                stdout, stderr = self.run_main_capture_all([])
+                self.assertIn(f"Using {expected} hashing algorithm", stderr)
+
+        # Test with MD5
+        with patch('sys.argv', ['file_matcher.py', self.test_dir1, self.test_dir2, '--hash', 'md5']):
             stdout, stderr = self.run_main_capture_all([])
             self.assertIn("Using MD5 hashing algorithm", stderr)
 
@@ -269,7 +311,7 @@ class TestActionExecution(BaseFileMatcherTest):
         # Mock execute_action to fail for specific files
         call_count = [0]
 
-        def mock_execute_action(duplicate, master, action, fallback_symlink=False, target_dir=None, dir2_base=None):
+        def mock_execute_action(duplicate, master, action, fallback_symlink=False, target_dir=None, dir2_base=None, resolved_master=None):
             call_count[0] += 1
             # Fail every other file
             if call_count[0] % 2 == 0:
@@ -543,5 +585,27 @@ class TestFormatterEdgeCases(BaseFileMatcherTest):
             self.assertIn('unmatchedMaster', parsed)
 
 
+class TestBuildLogFlags(unittest.TestCase):
+    """Tests for build_log_flags() audit header flag list."""
+
+    def test_only_base_flags_when_nothing_enabled(self):
+        """Disabled options add nothing and base flags are not mutated."""
+        base = ['--execute']
+        self.assertEqual(build_log_flags(base), ['--execute'])
+        self.assertEqual(base, ['--execute'])
+
+    def test_enabled_flags_in_order(self):
+        """Enabled options are appended in a fixed order with their values."""
+        flags = build_log_flags(['--execute'], verbose=True, yes=True, fallback_symlink=True,
+                                log_path='run.log', target_dir='/tmp/target')
+        self.assertEqual(flags, ['--execute', '--verbose', '--yes', '--fallback-symlink',
+                                 '--log run.log', '--target-dir /tmp/target'])
+
+    def test_jobs_only_recorded_when_parallel(self):
+        """--jobs appears in the header only when more than one job is used."""
+        self.assertEqual(build_log_flags(['--execute'], jobs=1), ['--execute'])
+        self.assertEqual(build_log_flags(['--execute'], jobs=4), ['--execute', '--jobs 4'])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -12,7 +12,7 @@ from unittest.mock import patch
 from filematcher import (
     index_directory, find_matching_files, get_file_hash,
     is_symlink_to, execute_action, is_hardlink_to,
-    filter_hardlinked_duplicates, main
+    filter_hardlinked_duplicates, check_cross_filesystem, main
 )
 from tests.test_base import BaseFileMatcherTest
 
@@ -37,6 +37,152 @@ class TestDirectoryOperations(BaseFileMatcherTest):
         files_with_hash = index1[file1_hash]
         self.assertEqual(len(files_with_hash), 2)
 
+    def test_index_directory_parallel_matches_serial(self):
+        """Hashing in a process pool gives the same index as serial hashing."""
+        for i in range(6):
+            with open(os.path.join(self.test_dir1, f"extra{i}.txt"), "w") as f:
+                f.write(f"extra {i % 3}")
+        serial = index_directory(self.test_dir1)
+        with patch('filematcher.directory.PARALLEL_HASH_MIN_FILES', 2):
+            parallel = index_directory(self.test_dir1, workers=2)
+        self.assertEqual({h: sorted(p) for h, p in parallel.items()}, {h: sorted(p) for h, p in serial.items()})
+
+    def test_index_directory_accepts_prefiltered_files(self):
+        """Given scan results, index_directory hashes just those files without walking again."""
+        from filematcher.directory import scan_files
+        files = scan_files(self.test_dir1)
+        kept = [entry for entry in files if os.path.basename(entry[0]) == "file1.txt"]
+        with patch('filematcher.directory.scan_files') as mock_scan:
+            index = index_directory(self.test_dir1, files=kept)
+        mock_scan.assert_not_called()
+        self.assertEqual(list(index.values()), [[kept[0][0]]])
+
+    def test_find_matching_files_shares_one_worker_pool(self):
+        """Both directories are hashed through a single process pool."""
+        from filematcher.directory import _start_hash_pool
+        serial = find_matching_files(self.test_dir1, self.test_dir2)
+        with patch('filematcher.directory.PARALLEL_HASH_MIN_FILES', 2), \
+                patch('filematcher.directory._start_hash_pool', side_effect=_start_hash_pool) as mock_pool:
+            parallel = find_matching_files(self.test_dir1, self.test_dir2, workers=2)
+        mock_pool.assert_called_once_with(2)
+        self.assertEqual(parallel, serial)
+
+    def test_find_matching_files_scans_directories_concurrently(self):
+        """With more than one worker both trees are walked at once; the results are unchanged."""
+        from filematcher.directory import scan_files
+        serial = find_matching_files(self.test_dir1, self.test_dir2)
+        with patch('filematcher.directory.scan_files', side_effect=scan_files) as mock_scan:
+            concurrent = find_matching_files(self.test_dir1, self.test_dir2, workers=2)
+        self.assertEqual(mock_scan.call_count, 2)
+        self.assertEqual(concurrent, serial)
+
+    @unittest.skipUnless(hasattr(os, 'posix_fadvise'), "requires os.posix_fadvise")
+    def test_hash_files_prefetches_upcoming_files(self):
+        """Serial hashing asks the kernel to read ahead every later file large enough to be worth it."""
+        from filematcher import hash_files, scan_files
+        big_dir = os.path.join(self.temp_dir, "big")
+        os.makedirs(big_dir)
+        for i in range(5):
+            with open(os.path.join(big_dir, f"big{i}.bin"), "wb") as f:
+                f.write(bytes([i]) * (128 * 1024))
+        files = scan_files(big_dir)
+        expected = [get_file_hash(path, raw=True) for path, _ in files]
+
+        opened = []
+        real_open = os.open
+        def tracking_open(path, *args, **kwargs):
+            opened.append(path)
+            return real_open(path, *args, **kwargs)
+
+        with patch('filematcher.directory.PREFETCH_DEPTH', 2), \
+                patch('filematcher.directory.os.open', side_effect=tracking_open), \
+                patch('filematcher.directory.os.posix_fadvise') as mock_fadvise:
+            hashes = [file_hash for _, _, file_hash in hash_files(files)]
+
+        self.assertEqual(hashes, expected)
+        self.assertEqual(opened, [path for path, _ in files[1:]])
+        self.assertEqual(mock_fadvise.call_count, 4)
+
+    def test_hash_files_throttles_inline_progress(self):
+        """On a terminal the progress line is redrawn at most once per interval, plus the final file."""
+        import io
+        from filematcher import hash_files, scan_files
+        files = scan_files(self.test_dir1)
+        self.assertGreater(len(files), 2)
+        stderr = io.StringIO()
+        stderr.isatty = lambda: True
+        with patch('sys.stderr', stderr), patch('filematcher.directory.time.monotonic', return_value=100.0):
+            list(hash_files(files, verbose=True))
+        self.assertEqual(stderr.getvalue().count('\r['), 2)
+        self.assertIn(f"[{len(files)}/{len(files)}]", stderr.getvalue())
+
+    def test_head_pass_progress_has_its_own_label(self):
+        """The head prefilter's progress says it checks heads, so it does not pass for full hashing."""
+        import io
+        from filematcher import hash_files, scan_files
+        files = scan_files(self.test_dir1)
+        stderr = io.StringIO()
+        stderr.isatty = lambda: True
+        with patch('sys.stderr', stderr):
+            list(hash_files(files, verbose=True, head_only=True))
+        self.assertIn("Checking head of", stderr.getvalue())
+        self.assertNotIn("Processing", stderr.getvalue())
+
+    def test_index_directory_records_device_ids(self):
+        """Indexed files get their st_dev recorded when a device_ids dict is passed."""
+        device_ids: dict[str, int] = {}
+        index1 = index_directory(self.test_dir1, device_ids=device_ids)
+        indexed = {path for files in index1.values() for path in files}
+        self.assertEqual(set(device_ids), indexed)
+        for path in indexed:
+            self.assertEqual(device_ids[path], os.stat(path).st_dev)
+
+    def test_scan_files_skips_symlinked_directories(self):
+        """The scandir walk lists nested files but does not descend into symlinked directories."""
+        from filematcher import scan_files
+        os.symlink(os.path.join(self.test_dir1, "subdir"), os.path.join(self.test_dir1, "linked_subdir"))
+        files = scan_files(self.test_dir1)
+        names = sorted(os.path.relpath(path, self.test_dir1) for path, _ in files)
+        self.assertEqual(len(names), 5)
+        self.assertIn(os.path.join("subdir", "nested1.txt"), names)
+        for path, file_stat in files:
+            self.assertEqual(file_stat.st_size, os.path.getsize(path))
+
+    @unittest.skipUnless(hasattr(os, 'mkfifo'), "requires os.mkfifo")
+    def test_scan_files_skips_special_files(self):
+        """Special files such as FIFOs are left out of the scan."""
+        from filematcher import scan_files
+        fifo = os.path.join(self.test_dir1, "pipe")
+        os.mkfifo(fifo)
+        paths = [path for path, _ in scan_files(self.test_dir1)]
+        self.assertEqual(len(paths), 5)
+        self.assertNotIn(os.path.realpath(fifo), paths)
+
+    def test_scan_files_returns_canonical_paths(self):
+        """Paths are resolved from the root once; symlinked files resolve to their target."""
+        from filematcher import scan_files
+        linked_root = os.path.join(self.temp_dir, "linked_root")
+        os.symlink(self.test_dir1, linked_root)
+        target = os.path.join(self.test_dir1, "file1.txt")
+        os.symlink(target, os.path.join(self.test_dir1, "subdir", "file1_link.txt"))
+
+        paths = [str(path) for path, _ in scan_files(linked_root)]
+        self.assertEqual(paths, [os.path.realpath(p) for p in paths])
+        self.assertEqual(paths.count(os.path.realpath(target)), 2)
+
+    def test_index_keys_are_raw_digests_hex_encoded_at_the_boundary(self):
+        """Hashing yields raw digests; index_directory and find_matching_files return hex keys."""
+        from filematcher.directory import hash_files, scan_files
+        files = scan_files(self.test_dir1)
+        for path, _, digest in hash_files(files):
+            self.assertEqual(digest, get_file_hash(path, raw=True))
+            self.assertEqual(digest.hex(), get_file_hash(path))
+        index1 = index_directory(self.test_dir1)
+        matches, _, _ = find_matching_files(self.test_dir1, self.test_dir2)
+        for key in list(index1) + list(matches):
+            self.assertIsInstance(key, str)
+        self.assertTrue(set(matches) <= set(index1))
+
     def test_find_matching_files(self):
         """Test the main matching functionality."""
         matches, unmatched1, unmatched2 = find_matching_files(self.test_dir1, self.test_dir2)
@@ -59,7 +205,73 @@ class TestDirectoryOperations(BaseFileMatcherTest):
         
         # In dir2: file4.txt, common_name.txt, subdir/different_nested.txt
         self.assertEqual(len(unmatched2), 3)
-    
+
+    def test_find_matching_files_skips_unique_sizes(self):
+        """Files whose size does not occur in the other directory are never hashed."""
+        unique = os.path.join(self.test_dir1, "unique_size.txt")
+        with open(unique, "w") as f:
+            f.write("a file with a size no file in dir2 has" * 10)
+
+        from filematcher.directory import _hash_file
+        with patch('filematcher.directory._hash_file', side_effect=_hash_file) as mock_hash:
+            matches, unmatched1, _ = find_matching_files(self.test_dir1, self.test_dir2)
+
+        hashed = {str(call.args[0]) for call in mock_hash.call_args_list}
+        self.assertNotIn(unique, hashed)
+        self.assertIn(str(Path(unique).resolve()), unmatched1)
+        self.assertEqual(len(matches), 1)
+
+    def test_find_matching_files_records_sizes(self):
+        """Sizes from the scan are recorded for hashed files and reused by build_file_sizes."""
+        from filematcher import build_file_sizes
+        file_sizes: dict[str, int] = {}
+        matches, _, _ = find_matching_files(self.test_dir1, self.test_dir2, file_sizes=file_sizes)
+        matched = [path for files1, files2 in matches.values() for path in files1 + files2]
+        for path in matched:
+            self.assertEqual(file_sizes[path], os.path.getsize(path))
+
+        with patch('filematcher.cli.os.path.getsize') as mock_getsize:
+            self.assertEqual(build_file_sizes(matched, file_sizes), {p: file_sizes[p] for p in matched})
+        mock_getsize.assert_not_called()
+
+    def test_find_matching_files_skips_full_hash_on_head_mismatch(self):
+        """Same-size large files whose first bytes differ are never hashed in full."""
+        from filematcher.directory import _hash_file
+        from filematcher.hashing import HEAD_HASH_SIZE
+        size = HEAD_HASH_SIZE * 3
+        head_differs1 = os.path.join(self.test_dir1, "big_a.bin")
+        head_differs2 = os.path.join(self.test_dir2, "big_b.bin")
+        same1 = os.path.join(self.test_dir1, "big_same.bin")
+        same2 = os.path.join(self.test_dir2, "big_same_copy.bin")
+        for path, fill in ((head_differs1, b"a"), (head_differs2, b"b"), (same1, b"s"), (same2, b"s")):
+            with open(path, "wb") as f:
+                f.write(fill * size)
+
+        with patch('filematcher.directory._hash_file', side_effect=_hash_file) as mock_hash:
+            matches, unmatched1, unmatched2 = find_matching_files(self.test_dir1, self.test_dir2)
+
+        hashed = {str(call.args[0]) for call in mock_hash.call_args_list}
+        self.assertNotIn(os.path.realpath(head_differs1), hashed)
+        self.assertNotIn(os.path.realpath(head_differs2), hashed)
+        self.assertIn(os.path.realpath(head_differs1), unmatched1)
+        self.assertIn(os.path.realpath(head_differs2), unmatched2)
+        self.assertIn(([os.path.realpath(same1)], [os.path.realpath(same2)]), list(matches.values()))
+
+    def test_head_hashes_run_in_thread_pool(self):
+        """With several workers, the head-hash stage reads through a thread pool; results are unchanged."""
+        from filematcher.directory import _start_read_pool
+        from filematcher.hashing import HEAD_HASH_SIZE
+        for i in range(3):
+            for directory, fill in ((self.test_dir1, b"x"), (self.test_dir2, b"x" if i else b"y")):
+                with open(os.path.join(directory, f"big{i}.bin"), "wb") as f:
+                    f.write(fill * (HEAD_HASH_SIZE * 2) + bytes([i]))
+        serial = find_matching_files(self.test_dir1, self.test_dir2)
+        with patch('filematcher.directory.PARALLEL_HASH_MIN_FILES', 2), \
+                patch('filematcher.directory._start_read_pool', side_effect=_start_read_pool) as mock_pool:
+            threaded = find_matching_files(self.test_dir1, self.test_dir2, workers=2)
+        mock_pool.assert_called_once_with(2)
+        self.assertEqual(threaded, serial)
+
     def test_with_real_directories(self):
         """Test with the actual test directories in the project."""
         # Get the absolute path of the current script's directory
@@ -177,6 +389,15 @@ class TestDifferentNamesOnly(unittest.TestCase):
         # Now the "identical content A" group has different names, so it should be included
         self.assertEqual(len(matches), 2)
 
+    def test_different_names_only_with_mixed_names_in_dir1(self):
+        """A group whose dir1 side already has two names is kept."""
+        os.makedirs(os.path.join(self.dir1, "sub"))
+        with open(os.path.join(self.dir1, "sub", "copy.txt"), "w") as f:
+            f.write("identical content A\n")
+
+        matches, _, _ = find_matching_files(self.dir1, self.dir2, different_names_only=True)
+        self.assertEqual(len(matches), 2)
+
 
 class TestIsHardlinkTo(unittest.TestCase):
     """Tests for is_hardlink_to() function."""
@@ -399,6 +620,25 @@ class TestFilterHardlinkedDuplicates(unittest.TestCase):
         self.assertEqual(actionable, [])
         self.assertEqual(hardlinked, [])
 
+    def test_filter_uses_scanned_inodes(self):
+        """Device IDs and inodes recorded by the scan settle the check without an lstat."""
+        with open(self.master_file, "w") as f:
+            f.write("content")
+        os.link(self.master_file, self.dup1)
+        with open(self.dup2, "w") as f:
+            f.write("content")
+        paths = [self.master_file, self.dup1, self.dup2]
+        device_ids = {p: os.lstat(p).st_dev for p in paths}
+        inodes = {p: os.lstat(p).st_ino for p in paths}
+
+        with patch('filematcher.filesystem.os.lstat') as mock_lstat:
+            actionable, hardlinked = filter_hardlinked_duplicates(
+                self.master_file, [self.dup1, self.dup2], device_ids, inodes
+            )
+        mock_lstat.assert_not_called()
+        self.assertEqual(actionable, [self.dup2])
+        self.assertEqual(hardlinked, [self.dup1])
+
 
 class TestCrossFilesystemWarnings(BaseFileMatcherTest):
     """Tests for cross-filesystem detection and warnings in output."""
@@ -417,7 +657,7 @@ class TestCrossFilesystemWarnings(BaseFileMatcherTest):
         with patch('sys.argv', ['file_matcher.py', self.test_dir1, self.test_dir2, '--action', 'hardlink']):
             with patch('filematcher.cli.check_cross_filesystem') as mock_check:
                 # Return all duplicates as cross-filesystem
-                def mock_cross_fs(master_file, duplicates):
+                def mock_cross_fs(master_file, duplicates, device_ids=None):
                     return set(duplicates)
                 mock_check.side_effect = mock_cross_fs
                 output = self.run_main_with_args([])
@@ -431,6 +671,34 @@ class TestCrossFilesystemWarnings(BaseFileMatcherTest):
                 # Symlink and delete work across filesystems, so no warning needed
                 self.assertNotIn("[!cross-fs]", output)
 
+    def test_cross_fs_detection_skipped_for_symlink_or_delete(self):
+        """Cross-filesystem detection (per-file stat) is not run for symlink/delete."""
+        for action in ['symlink', 'delete']:
+            with patch('sys.argv', ['file_matcher.py', self.test_dir1, self.test_dir2, '--action', action]):
+                with patch('filematcher.cli.check_cross_filesystem') as mock_check:
+                    self.run_main_with_args([])
+                    mock_check.assert_not_called()
+
+
+class TestCrossFilesystemDeviceIds(unittest.TestCase):
+    """Tests for check_cross_filesystem with device IDs recorded during the scan."""
+
+    def test_known_device_ids_skip_stat(self):
+        """Device IDs from the scan answer the check without any stat."""
+        device_ids = {"/pool/a": 1, "/pool/b": 1, "/pool/c": 2}
+        with patch('filematcher.filesystem.get_device_id') as mock_dev:
+            result = check_cross_filesystem("/pool/a", ["/pool/b", "/pool/c"], device_ids)
+        self.assertEqual(result, {"/pool/c"})
+        mock_dev.assert_not_called()
+
+    def test_unknown_files_are_stated(self):
+        """Files missing from device_ids fall back to a stat each."""
+        devices = {"/data/b": 2, "/home/c": 1}
+        with patch('filematcher.filesystem.get_device_id', side_effect=devices.__getitem__) as mock_dev:
+            result = check_cross_filesystem("/data/a", ["/data/b", "/home/c"], {"/data/a": 1})
+        self.assertEqual(result, {"/data/b"})
+        self.assertEqual(mock_dev.call_count, 2)
+
 
 class TestIsInDirectory(unittest.TestCase):
     """Tests for is_in_directory() function - verifies path boundary checking."""
@@ -462,6 +730,19 @@ class TestIsInDirectory(unittest.TestCase):
         self.assertFalse(is_in_directory("/tmp/test_dir123/file.txt", "/tmp/test_dir"))
         self.assertFalse(is_in_directory("/tmp/test_dir_extra/file.txt", "/tmp/test_dir"))
 
+    def test_trailing_separator_and_root(self):
+        """A trailing separator on the directory and the root directory are handled."""
+        from filematcher import is_in_directory
+        self.assertTrue(is_in_directory("/tmp/mydir/file.txt", "/tmp/mydir/"))
+        self.assertTrue(is_in_directory("/tmp/file.txt", "/"))
+
+    def test_unnormalized_paths(self):
+        """Redundant separators and '.' components are ignored, as with Path.relative_to."""
+        from filematcher import is_in_directory
+        self.assertTrue(is_in_directory("/tmp/./mydir/file.txt", "/tmp/mydir"))
+        self.assertTrue(is_in_directory("/tmp//mydir/file.txt", "/tmp/mydir/."))
+        self.assertFalse(is_in_directory("//tmp/mydir/file.txt", "/tmp/mydir"))
+
     def test_exact_directory_match(self):
         """File path equal to directory itself returns True."""
         from filematcher import is_in_directory
@@ -192,6 +192,33 @@ class TestExecutionSummaryEnhanced(unittest.TestCase):
         self.assertIn('1,288,490,188 bytes', output)
         self.assertIn('Already linked: 2', output)  # skipped_count > 0
 
+    def test_text_summary_truncates_failed_files(self):
+        """Only the first max_errors_shown failures (sorted) are listed."""
+        formatter = TextActionFormatter(
+            preview_mode=False,
+            action='delete',
+            color_config=ColorConfig(mode=ColorMode.NEVER),
+            max_errors_shown=2
+        )
+        failed = [FailedOperation(f'/f{i}.txt', 'Error') for i in (3, 1, 4, 2)]
+
+        captured = StringIO()
+        with patch('sys.stdout', captured):
+            formatter.format_execution_summary(
+                success_count=0,
+                failure_count=4,
+                skipped_count=0,
+                space_saved=0,
+                log_path='/logs/audit.log',
+                failed_list=failed
+            )
+
+        output = captured.getvalue()
+        self.assertIn('/f1.txt', output)
+        self.assertIn('/f2.txt', output)
+        self.assertNotIn('/f3.txt', output)
+        self.assertIn('... (2 more, see audit log)', output)
+
     def test_json_summary_includes_user_counts(self):
         """Verify JSON has userConfirmedCount and userSkippedCount."""
         formatter = JsonActionFormatter(
@@ -324,7 +351,7 @@ class TestInteractiveExecuteErrorHandling(BaseFileMatcherTest):
         mock_formatter.format_group_prompt.return_value = 'test? '
 
         with patch('builtins.input', return_value='y'):
-            with patch('os.path.getsize', side_effect=PermissionError("Permission denied")):
+            with patch('filematcher.cli.os.stat', side_effect=PermissionError("Permission denied")):
                 with patch('os.path.exists', return_value=True):
                     result = interactive_execute(
                         groups=groups,
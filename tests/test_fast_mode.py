@@ -77,6 +77,68 @@ class TestFastMode(BaseFileMatcherTest):
         small_file_hash = get_file_hash(different_size_path, 'md5', fast_mode=True)
         self.assertNotEqual(fast_hash1, small_file_hash)
         
+    def test_sparse_hash_samples_expected_offsets(self):
+        """The pread sampling hashes the size plus start, quarter, middle, three-quarter and end."""
+        import hashlib
+        sample = 1024
+        path = os.path.join(self.temp_dir, "sampled.bin")
+        data = bytes(random.Random(7).getrandbits(8) for _ in range(10 * sample))
+        with open(path, 'wb') as f:
+            f.write(data)
+
+        size = len(data)
+        expected = hashlib.md5(str(size).encode('utf-8'))
+        for offset in (0, size // 4 - sample // 2, size // 2 - sample // 2,
+                       (size * 3) // 4 - sample // 2, size - sample):
+            expected.update(data[offset:offset + sample])
+        self.assertEqual(get_sparse_hash(path, 'md5', sample_size=sample), expected.hexdigest())
+
+    def test_sparse_hash_with_overlapping_samples(self):
+        """Overlapping samples are read once per span but hashed exactly as if sampled one by one."""
+        import hashlib
+        from unittest.mock import patch
+        sample = 1024
+        path = os.path.join(self.temp_dir, "overlapping.bin")
+        data = bytes(random.Random(11).getrandbits(8) for _ in range(4 * sample))
+        with open(path, 'wb') as f:
+            f.write(data)
+
+        size = len(data)
+        expected = hashlib.md5(str(size).encode('utf-8'))
+        for offset in filematcher.hashing._sparse_offsets(size, sample):
+            expected.update(data[offset:offset + sample])
+        self.assertEqual(filematcher.hashing._sample_spans([0, 512, 2048], sample), [(0, 1536), (2048, 3072)])
+        with patch('filematcher.hashing.os.pread') as mock_pread:
+            self.assertEqual(get_sparse_hash(path, 'md5', sample_size=sample), expected.hexdigest())
+        mock_pread.assert_not_called()
+
+    @unittest.skipUnless(hasattr(os, 'posix_fadvise'), "posix_fadvise not available")
+    def test_sparse_hash_ignores_rejected_readahead_hint(self):
+        """A filesystem rejecting the WILLNEED hint does not fail the sparse hash."""
+        import errno
+        from unittest.mock import patch
+        sample = 1024
+        path = os.path.join(self.temp_dir, "no_fadvise.bin")
+        with open(path, 'wb') as f:
+            f.write(bytes(random.Random(13).getrandbits(8) for _ in range(10 * sample)))
+
+        expected = get_sparse_hash(path, 'md5', sample_size=sample)
+        with patch('filematcher.hashing.os.posix_fadvise', side_effect=OSError(errno.EINVAL, "Invalid argument")):
+            self.assertEqual(get_sparse_hash(path, 'md5', sample_size=sample), expected)
+
+    def test_sparse_hash_of_small_file_reads_whole_file(self):
+        """Files too small to sample hash the size prefix plus all content, with or without file_digest."""
+        import hashlib
+        from unittest.mock import patch
+        path = os.path.join(self.temp_dir, "small_sparse.bin")
+        data = b"0123456789" * 500
+        with open(path, 'wb') as f:
+            f.write(data)
+        expected = hashlib.md5(str(len(data)).encode('utf-8') + data).hexdigest()
+        self.assertEqual(get_sparse_hash(path, 'md5', sample_size=4096), expected)
+        with patch.object(hashlib, 'file_digest', None, create=True):
+            self.assertEqual(get_sparse_hash(path, 'md5', sample_size=4096), expected)
+
     def test_fast_mode_in_directory_comparison(self):
         """Test that fast mode works correctly when comparing directories."""
         # Create test files in temporary subdirectories
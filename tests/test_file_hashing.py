@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 
+import hashlib
+import mmap
 import os
 import random
 import shutil
 import unittest
+from unittest.mock import patch
 
-from filematcher import get_file_hash, format_file_size
+from filematcher import get_file_hash, get_mapped_hash, format_file_size
 from tests.test_base import BaseFileMatcherTest
 
 
@@ -26,6 +29,17 @@ class TestFileHashing(BaseFileMatcherTest):
         
         # Test with different hash algorithm
         self.assertEqual(get_file_hash(file1, "sha256"), get_file_hash(file2, "sha256"))
+        self.assertEqual(get_file_hash(file1, "blake2b"), get_file_hash(file2, "blake2b"))
+        self.assertNotEqual(get_file_hash(file1, "blake2b"), get_file_hash(file3, "blake2b"))
+        self.assertEqual(len(get_file_hash(file1, "blake2b")), 32)
+
+    def test_known_file_size_skips_stat(self):
+        """A file_size from the caller is used instead of stat'ing the file again."""
+        file1 = os.path.join(self.test_dir1, "file1.txt")
+        expected = get_file_hash(file1)
+        with patch('filematcher.hashing.os.path.getsize') as mock_getsize:
+            self.assertEqual(get_file_hash(file1, file_size=os.stat(file1).st_size), expected)
+        mock_getsize.assert_not_called()
 
     def test_large_file_chunking(self):
         """Test that file hashing works correctly with large files that require chunking."""
@@ -82,6 +96,106 @@ class TestFileHashing(BaseFileMatcherTest):
         modified_hash_sha256 = get_file_hash(duplicate_file_path, 'sha256')
         self.assertNotEqual(hash1_sha256, modified_hash_sha256)
     
+    def test_mapped_hash_matches_full_read(self):
+        """Memory-mapped hashing produces the same digest as hashing the raw bytes."""
+        path = os.path.join(self.temp_dir, "mapped.bin")
+        data = os.urandom(3 * mmap.ALLOCATIONGRANULARITY + 123)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+        expected = hashlib.md5(data).hexdigest()
+        self.assertEqual(get_file_hash(path), expected)
+        self.assertEqual(get_mapped_hash(path), expected)
+
+        # Force the windowed path used for very large files
+        with patch('filematcher.hashing.MMAP_MAX_SIZE', mmap.ALLOCATIONGRANULARITY), \
+             patch('filematcher.hashing.MMAP_WINDOW_SIZE', mmap.ALLOCATIONGRANULARITY):
+            self.assertEqual(get_mapped_hash(path), expected)
+
+    def test_small_file_hash_with_and_without_file_digest(self):
+        """The read path gives the same digest via hashlib.file_digest and the read() loop."""
+        from filematcher.hashing import _read_hasher
+        data = b"small file content" * 100
+        path = os.path.join(self.test_dir1, "small.bin")
+        with open(path, "wb") as f:
+            f.write(data)
+        expected = hashlib.sha256(data).hexdigest()
+        self.assertEqual(get_file_hash(path, 'sha256'), expected)
+        self.assertEqual(_read_hasher(path, 'sha256').hexdigest(), expected)
+        with patch.object(hashlib, 'file_digest', None, create=True):
+            self.assertEqual(_read_hasher(path, 'sha256').hexdigest(), expected)
+
+    def test_small_file_skips_file_digest(self):
+        """Files below the mmap threshold are hashed from a single read, not through file_digest."""
+        path = os.path.join(self.test_dir1, "file1.txt")
+        with open(path, "rb") as f:
+            expected = hashlib.md5(f.read()).hexdigest()
+        with patch('filematcher.hashing._read_hasher') as mock_read_hasher:
+            self.assertEqual(get_file_hash(path, 'md5'), expected)
+        mock_read_hasher.assert_not_called()
+
+    def test_head_hash_mixes_in_file_size(self):
+        """With file_size given, files sharing leading bytes but not size get different head digests."""
+        from filematcher.hashing import get_head_hash
+        short = os.path.join(self.test_dir1, "short.bin")
+        long = os.path.join(self.test_dir1, "long.bin")
+        with open(short, "wb") as f:
+            f.write(b"x" * 100)
+        with open(long, "wb") as f:
+            f.write(b"x" * 200)
+        self.assertEqual(get_head_hash(short, head_size=50), get_head_hash(long, head_size=50))
+        self.assertNotEqual(
+            get_head_hash(short, head_size=50, file_size=100, raw=True),
+            get_head_hash(long, head_size=50, file_size=200, raw=True)
+        )
+        self.assertEqual(get_head_hash(short, file_size=100, raw=True).hex(), get_head_hash(short, file_size=100))
+
+    def test_cpu_has_sha_extensions(self):
+        """SHA instruction support is read from the cpuinfo flags; unknown without cpuinfo."""
+        from filematcher import cpu_has_sha_extensions
+        cpuinfo = os.path.join(self.temp_dir, "cpuinfo")
+        cases = [
+            ("flags\t\t: fpu sse2 sha_ni avx2\n", True),
+            ("Features\t: fp asimd sha1 sha2\n", True),
+            ("flags\t\t: fpu sse2 avx2\n", False),
+        ]
+        try:
+            for content, expected in cases:
+                with open(cpuinfo, "w") as f:
+                    f.write("processor\t: 0\n" + content)
+                cpu_has_sha_extensions.cache_clear()
+                with patch('filematcher.hashing.CPUINFO_PATH', cpuinfo):
+                    self.assertIs(cpu_has_sha_extensions(), expected)
+            cpu_has_sha_extensions.cache_clear()
+            with patch('filematcher.hashing.CPUINFO_PATH', os.path.join(self.temp_dir, "missing")):
+                self.assertIsNone(cpu_has_sha_extensions())
+        finally:
+            cpu_has_sha_extensions.cache_clear()
+
+    def test_resolve_auto_hash_algorithm(self):
+        """'auto' prefers an installed blake3, then SHA-256 only when the CPU has SHA instructions."""
+        from filematcher import resolve_hash_algorithm
+        with patch('filematcher.hashing._load_blake3', return_value=object()):
+            self.assertEqual(resolve_hash_algorithm('auto'), 'blake3')
+        with patch('filematcher.hashing._load_blake3', return_value=None):
+            with patch('filematcher.hashing.cpu_has_sha_extensions', return_value=True):
+                self.assertEqual(resolve_hash_algorithm('auto'), 'sha256')
+            for detected in (False, None):
+                with patch('filematcher.hashing.cpu_has_sha_extensions', return_value=detected):
+                    self.assertEqual(resolve_hash_algorithm('auto'), 'blake2b')
+        self.assertEqual(resolve_hash_algorithm('md5'), 'md5')
+
+    def test_blake3_hasher_requires_package(self):
+        """blake3 hashers come from the optional package; without it create_hasher says how to get it."""
+        from unittest.mock import MagicMock
+        from filematcher import create_hasher
+        module = MagicMock()
+        with patch('filematcher.hashing._load_blake3', return_value=module):
+            self.assertIs(create_hasher('blake3'), module.blake3.return_value)
+        with patch('filematcher.hashing._load_blake3', return_value=None):
+            with self.assertRaisesRegex(ValueError, "pip install blake3"):
+                create_hasher('blake3')
+
     def test_format_file_size(self):
         """Test the file size formatting function."""
         # Test bytes
@@ -105,6 +219,9 @@ class TestFileHashing(BaseFileMatcherTest):
         # Test terabytes
         self.assertEqual(format_file_size(1024*1024*1024*1024), "1.0 TB")
 
+        # Sizes beyond TB stay in TB
+        self.assertEqual(format_file_size(1024**5), "1024.0 TB")
+
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -6,15 +6,25 @@ Tests cover:
 - TextActionFormatter.format_confirmation_status() - checkmark/X output
 - TextActionFormatter.format_remaining_count() - remaining groups message
 - JsonActionFormatter no-op implementations of the above
+- calculate_space_savings() - space and cross-filesystem counts
+- calculate_compare_stats() - compare mode match counts
 """
 
 from __future__ import annotations
 
 import io
+import os
+import shutil
+import tempfile
 import unittest
 from contextlib import redirect_stdout
+from unittest.mock import patch
 
-from filematcher.formatters import TextActionFormatter, JsonActionFormatter
+from filematcher.formatters import (
+    TextActionFormatter, JsonActionFormatter, calculate_space_savings, calculate_compare_stats,
+    format_group_lines,
+)
+from filematcher.types import DuplicateGroup
 from filematcher.colors import ColorConfig, ColorMode
 
 
@@ -172,5 +182,72 @@ class TestJsonActionFormatterPrompts(unittest.TestCase):
         self.assertEqual(output, "")
 
 
+class TestCalculateSpaceSavings(unittest.TestCase):
+    """Tests for calculate_space_savings() aggregate counts."""
+
+    def setUp(self):
+        """Create a master file and two duplicates."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.master = os.path.join(self.temp_dir, "master.txt")
+        self.dup1 = os.path.join(self.temp_dir, "dup1.txt")
+        self.dup2 = os.path.join(self.temp_dir, "dup2.txt")
+        for path in (self.master, self.dup1, self.dup2):
+            with open(path, "w") as f:
+                f.write("x" * 100)
+        self.groups = [DuplicateGroup(self.master, [self.dup1, self.dup2], "test", "abc")]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_counts_without_cross_fs(self):
+        """Space, duplicate and group counts are computed; cross-fs count defaults to 0."""
+        info = calculate_space_savings(self.groups)
+        self.assertEqual(info.bytes_saved, 200)
+        self.assertEqual(info.duplicate_count, 2)
+        self.assertEqual(info.group_count, 1)
+        self.assertEqual(info.cross_fs_count, 0)
+
+    def test_counts_cross_fs_in_same_pass(self):
+        """Duplicates in cross_fs_files are counted."""
+        info = calculate_space_savings(self.groups, {self.dup2})
+        self.assertEqual(info.cross_fs_count, 1)
+
+    def test_uses_known_master_size(self):
+        """A master size from file_sizes is used without statting the file."""
+        with patch('filematcher.formatters.os.path.getsize') as mock_getsize:
+            info = calculate_space_savings(self.groups, file_sizes={self.master: 50})
+        mock_getsize.assert_not_called()
+        self.assertEqual(info.bytes_saved, 100)
+
+
+class TestCalculateCompareStats(unittest.TestCase):
+    """Tests for calculate_compare_stats() counts."""
+
+    def test_counts_matches_and_unmatched(self):
+        """Matched files are counted per directory alongside unmatched totals."""
+        matches = {
+            "h1": (["/a/1", "/a/2"], ["/b/1"]),
+            "h2": (["/a/3"], ["/b/2", "/b/3", "/b/4"]),
+        }
+        stats = calculate_compare_stats(matches, ["/a/x"], ["/b/x", "/b/y"])
+        self.assertEqual(stats.match_count, 2)
+        self.assertEqual(stats.matched_files1, 3)
+        self.assertEqual(stats.matched_files2, 4)
+        self.assertEqual(stats.unmatched_count1, 1)
+        self.assertEqual(stats.unmatched_count2, 2)
+
+
+class TestFormatGroupLinesPresorted(unittest.TestCase):
+    """Tests for the presorted flag of format_group_lines()."""
+
+    def test_sorts_by_default(self):
+        lines = format_group_lines("/m", [("/b", "DUP"), ("/a", "DUP")])
+        self.assertEqual([line.path for line in lines[1:]], ["/a", "/b"])
+
+    def test_presorted_keeps_input_order(self):
+        lines = format_group_lines("/m", [("/b", "DUP"), ("/a", "DUP")], presorted=True)
+        self.assertEqual([line.path for line in lines[1:]], ["/b", "/a"])
+
+
 if __name__ == "__main__":
     unittest.main()
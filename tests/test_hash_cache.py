@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+
+from filematcher import find_matching_files, main
+from filematcher.cache import HashCache
+from tests.test_base import BaseFileMatcherTest
+
+
+class TestHashCache(BaseFileMatcherTest):
+    """Tests for the persistent --cache hash store."""
+
+    def setUp(self):
+        super().setUp()
+        self.cache_path = os.path.join(self.temp_dir, "hashes.db")
+
+    def test_rerun_reuses_cached_digests(self):
+        """A second run with the same cache hashes nothing and finds the same matches."""
+        with HashCache(self.cache_path, 'md5') as cache:
+            first = find_matching_files(self.test_dir1, self.test_dir2, cache=cache)
+            self.assertTrue(len(cache))
+
+        with HashCache(self.cache_path, 'md5') as cache, \
+                patch('filematcher.directory._hash_file') as mock_hash:
+            second = find_matching_files(self.test_dir1, self.test_dir2, cache=cache)
+        mock_hash.assert_not_called()
+        self.assertEqual(second, first)
+
+    def test_cached_files_skip_head_prefilter(self):
+        """Cached large files are not head-read, nor are uncached files the same size as a cached file opposite."""
+        from filematcher.directory import HEAD_FILTER_MIN_SIZE
+        content = os.urandom(HEAD_FILTER_MIN_SIZE)
+        for path in (os.path.join(self.test_dir1, "big.bin"), os.path.join(self.test_dir2, "big_copy.bin")):
+            with open(path, "wb") as f:
+                f.write(content)
+        with HashCache(self.cache_path, 'md5') as cache:
+            find_matching_files(self.test_dir1, self.test_dir2, cache=cache)
+
+        new_copy = os.path.join(self.test_dir2, "big_new.bin")
+        with open(new_copy, "wb") as f:
+            f.write(content)
+        with HashCache(self.cache_path, 'md5') as cache, \
+                patch('filematcher.directory._hash_head') as mock_head:
+            matches, _, _ = find_matching_files(self.test_dir1, self.test_dir2, cache=cache)
+        mock_head.assert_not_called()
+        matched2 = {os.path.basename(p) for _, files2 in matches.values() for p in files2}
+        self.assertIn("big_new.bin", matched2)
+
+    def test_uncached_pair_sizing_with_cached_file_still_matches(self):
+        """An uncached pair the size of a file cached on one side is matched, not dropped by the head filter."""
+        from filematcher import get_file_hash
+        from filematcher.directory import HEAD_FILTER_MIN_SIZE
+        size = HEAD_FILTER_MIN_SIZE
+        pair = os.urandom(size)
+        other_pair = os.urandom(size + 1)
+        files = [
+            (self.test_dir1, "A.bin", os.urandom(size)),
+            # B and C: identical, uncached, the same size as the cached A
+            (self.test_dir1, "B.bin", pair),
+            (self.test_dir2, "C.bin", pair),
+            # A second large pair of another size, so the head filter runs
+            (self.test_dir1, "D.bin", other_pair),
+            (self.test_dir2, "E.bin", other_pair),
+        ]
+        for directory, name, content in files:
+            with open(os.path.join(directory, name), "wb") as f:
+                f.write(content)
+
+        without_cache, _, _ = find_matching_files(self.test_dir1, self.test_dir2)
+        cached_path = os.path.realpath(os.path.join(self.test_dir1, "A.bin"))
+        with HashCache(self.cache_path, 'md5') as cache:
+            cache.put(os.stat(cached_path), get_file_hash(cached_path, 'md5', raw=True))
+            with_cache, unmatched1, unmatched2 = find_matching_files(self.test_dir1, self.test_dir2, cache=cache)
+        self.assertEqual(with_cache, without_cache)
+        self.assertNotIn("B.bin", {os.path.basename(p) for p in unmatched1})
+        self.assertNotIn("C.bin", {os.path.basename(p) for p in unmatched2})
+
+    def test_changed_file_is_rehashed(self):
+        """An entry goes stale when the file's size or mtime changes."""
+        path = os.path.realpath(os.path.join(self.test_dir1, "file1.txt"))
+        with HashCache(self.cache_path, 'md5') as cache:
+            cache.put(os.stat(path), b"stale")
+            self.assertEqual(cache.get(os.stat(path)), b"stale")
+
+        with open(path, "a") as f:
+            f.write("more\n")
+        with HashCache(self.cache_path, 'md5') as cache:
+            self.assertIsNone(cache.get(os.stat(path)))
+
+    def test_entries_follow_the_inode(self):
+        """Renamed files keep their entry, and hardlinked paths share one."""
+        path = os.path.join(self.test_dir1, "file1.txt")
+        renamed = os.path.join(self.test_dir1, "renamed.txt")
+        with HashCache(self.cache_path, 'md5') as cache:
+            cache.put(os.stat(path), b"digest")
+        os.rename(path, renamed)
+        linked = os.path.join(self.test_dir2, "linked.txt")
+        os.link(renamed, linked)
+        with HashCache(self.cache_path, 'md5') as cache:
+            self.assertEqual(cache.get(os.stat(renamed)), b"digest")
+            self.assertEqual(cache.get(os.stat(linked)), b"digest")
+
+    def test_entries_are_per_algorithm_and_mode(self):
+        """Digests cached for one algorithm or mode are not served for another."""
+        path = os.path.realpath(os.path.join(self.test_dir1, "file1.txt"))
+        with HashCache(self.cache_path, 'md5') as cache:
+            cache.put(os.stat(path), b"md5 digest")
+        with HashCache(self.cache_path, 'sha256') as cache:
+            self.assertIsNone(cache.get(os.stat(path)))
+        with HashCache(self.cache_path, 'md5', fast_mode=True) as cache:
+            self.assertIsNone(cache.get(os.stat(path)))
+
+    def test_cli_cache_option(self):
+        """--cache creates the database, and an unusable cache path only warns."""
+        with patch('sys.argv', ['filematcher', self.test_dir1, self.test_dir2, '--cache', self.cache_path]):
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(main(), 0)
+        self.assertTrue(os.path.exists(self.cache_path))
+
+        bad_path = os.path.join(self.temp_dir, "missing", "hashes.db")
+        stderr = io.StringIO()
+        with patch('sys.argv', ['filematcher', self.test_dir1, self.test_dir2, '--cache', bad_path]):
+            with redirect_stdout(io.StringIO()), redirect_stderr(stderr):
+                self.assertEqual(main(), 0)
+        self.assertIn("Could not open hash cache", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -423,12 +423,22 @@ class TestJsonOutput(BaseFileMatcherTest):
         self.assertEqual(data['header']['hashAlgorithm'], 'sha256')
 
     def test_json_with_hash_md5(self):
-        """hashAlgorithm shows correct value when using MD5 (default)."""
-        data, stderr, exit_code = self.run_main_with_json()
+        """hashAlgorithm shows correct value when using MD5."""
+        data, stderr, exit_code = self.run_main_with_json(['--hash', 'md5'])
         self.assertEqual(exit_code, 0)
 
         self.assertEqual(data['header']['hashAlgorithm'], 'md5')
 
+    def test_json_default_hash_is_blake2b(self):
+        """Without SHA instructions the default hash is BLAKE2b, with an MD5-width digest."""
+        with patch('filematcher.hashing._load_blake3', return_value=None), \
+                patch('filematcher.hashing.cpu_has_sha_extensions', return_value=False):
+            data, stderr, exit_code = self.run_main_with_json()
+        self.assertEqual(exit_code, 0)
+
+        self.assertEqual(data['header']['hashAlgorithm'], 'blake2b')
+        self.assertTrue(all(len(group['hash']) == 32 for group in data['matches']))
+
     def test_json_with_different_names_only(self):
         """--different-names-only filter is applied before JSON output."""
         # Run without filter
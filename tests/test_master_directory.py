@@ -11,7 +11,7 @@ from contextlib import redirect_stdout, redirect_stderr
 from pathlib import Path
 from unittest.mock import patch
 
-from filematcher import main
+from filematcher import main, select_master_file, select_oldest
 from tests.test_base import BaseFileMatcherTest
 
 
@@ -185,5 +185,48 @@ class TestMasterDirectoryTimestamp(BaseFileMatcherTest):
             self.assertTrue(len(dup_lines) > 0, "very_old.txt should appear as duplicate")
 
 
+class TestSelectMasterFile(BaseFileMatcherTest):
+    """Unit tests for select_master_file() and select_oldest()."""
+
+    def _make_file(self, directory: str, name: str, age_seconds: int = 0) -> str:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, name)
+        with open(path, "w") as f:
+            f.write("same content\n")
+        if age_seconds:
+            old_time = time.time() - age_seconds
+            os.utime(path, (old_time, old_time))
+        return path
+
+    def test_select_oldest_keeps_order_of_others(self):
+        """Oldest file is returned; the rest keep their input order."""
+        a = self._make_file(self.temp_dir, "a.txt")
+        b = self._make_file(self.temp_dir, "b.txt", age_seconds=3600)
+        c = self._make_file(self.temp_dir, "c.txt")
+        oldest, others = select_oldest([a, b, c])
+        self.assertEqual(oldest, b)
+        self.assertEqual(others, [a, c])
+
+    def test_select_oldest_uses_known_mtimes(self):
+        """mtimes already recorded by the scan are used instead of stat'ing again."""
+        a = self._make_file(self.temp_dir, "a.txt")
+        b = self._make_file(self.temp_dir, "b.txt")
+        with patch('filematcher.directory.os.path.getmtime') as mock_getmtime:
+            oldest, others = select_oldest([a, b], {a: 200.0, b: 100.0})
+        mock_getmtime.assert_not_called()
+        self.assertEqual((oldest, others), (b, [a]))
+
+    def test_sibling_with_shared_prefix_not_treated_as_master(self):
+        """A directory like master_extra is not inside master."""
+        master_dir = os.path.join(self.temp_dir, "master")
+        sibling_dir = os.path.join(self.temp_dir, "master_extra")
+        in_master = self._make_file(master_dir, "keep.txt")
+        in_sibling = self._make_file(sibling_dir, "older.txt", age_seconds=3600)
+        master, duplicates, reason = select_master_file([in_sibling, in_master], Path(master_dir))
+        self.assertEqual(master, in_master)
+        self.assertEqual(duplicates, [in_sibling])
+        self.assertEqual(reason, "only file in master directory")
+
+
 if __name__ == "__main__":
     unittest.main()
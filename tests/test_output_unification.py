@@ -25,14 +25,14 @@ class TestStreamSeparation(unittest.TestCase):
         self.test_dir2 = str(Path(__file__).parent.parent / "test_dir2")
 
     def test_logger_messages_go_to_stderr(self):
-        """Verify logger messages (Using MD5...) go to stderr, not stdout."""
+        """Verify logger messages (Using BLAKE2B/SHA256...) go to stderr, not stdout."""
         result = subprocess.run(
             [sys.executable, "file_matcher.py", self.test_dir1, self.test_dir2],
             capture_output=True,
             text=True
         )
         # Logger messages should be on stderr
-        self.assertIn("Using MD5", result.stderr)
+        self.assertRegex(result.stderr, r"Using (BLAKE2B|BLAKE3|SHA256)")
         # Data should be on stdout (MASTER/DUPLICATE labels, Hash only in verbose)
         self.assertIn("MASTER:", result.stdout)
         self.assertIn("DUPLICATE:", result.stdout)
@@ -338,7 +338,7 @@ class TestStreamSeparationWithJson(unittest.TestCase):
         self.assertIsInstance(data, dict)
 
         # stderr should have progress messages
-        self.assertIn("Using MD5", result.stderr)
+        self.assertRegex(result.stderr, r"Using (BLAKE2B|BLAKE3|SHA256)")
 
     def test_json_with_quiet_clean_stdout(self):
         """--json --quiet should have clean stdout and no stderr."""